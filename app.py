@@ -1,9 +1,13 @@
 import io
-import uvicorn
+import os
+import asyncio
+import base64
+import json
+import time
 from mangum import Mangum
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, APIRouter, Path, Header, Query, Body
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, APIRouter, Path, Header, Query, Body, BackgroundTasks
+from fastapi.responses import StreamingResponse, HTMLResponse, Response
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 import secrets
@@ -13,7 +17,7 @@ from database.model import (
     UserPublic, JobDetailsInput, UserAppMetadata,
     ResumeCreate, ResumeUpdate, ResumePublic, ResumeSchema, ResumeInDB,
     UserCreate as UserModelCreate, UserInDB as UserInDBModel, UsersResponse, MetadataResponse, ResumeBase,
-    LinkedInJobRequest, LinkedInJobResponse, JobData
+    LinkedInJobRequest, LinkedInJobResponse, JobData, GalleryRequest, GalleryVariant
 )
 import database.crud as crud
 from utils import auth
@@ -24,8 +28,19 @@ from pydantic import BaseModel
 
 # from services import llm_service, pdf_service
 from core.config import settings
-from services import ResumeBuilder, JsonToPDFBuilder
-from utils import FileOperations, WebScraper
+# ReportLab, PyMuPDF, openai and BeautifulSoup are imported inside the routes
+# that use them, so a cold start (e.g. login on Lambda) does not load them
+from services.PDFRenderPool import PDFRenderPool, RenderPoolSaturated, RenderTimeout
+from services.PDFArtifactStore import PDFArtifactStore
+from services.PDFOptimizer import pdf_page_count
+from services.RenderedPDFCache import RenderedPDFCache
+from services.UploadParseCache import UploadParseCache
+from services.RenderMetrics import RenderMetrics
+from services.PDFThumbnailer import ThumbnailCache, DEFAULT_THUMBNAIL_WIDTH, MAX_THUMBNAIL_WIDTH
+from utils.ZipStreamWriter import ZipStreamWriter
+from utils.PDFResponse import pdf_response
+from utils.PDFTextExtractor import shutdown_pdf_extractor
+from utils.UploadIngestor import SpooledUpload, UploadIngestor, UploadRejected, UploadSizeLimit
 
 
 
@@ -65,8 +80,266 @@ async def get_redoc_documentation(username: str = Depends(get_current_username))
 async def openapi(username: str = Depends(get_current_username)):
     return get_openapi(title=app.title, version=app.version, routes=app.routes)
 
+# Refuse oversized uploads while they stream in, before the multipart parser spools them
+# (the slack covers the form's other fields and boundaries)
+app.add_middleware(UploadSizeLimit, max_body_bytes=settings.UPLOAD_MAX_BYTES + 64 * 1024,
+                   path_suffixes=("/upload-and-create",))
+
 handler = Mangum(app)  # For AWS Lambda compatibility
 
+pdf_render_pool = PDFRenderPool.from_settings(settings)
+pdf_cache = RenderedPDFCache.from_settings(settings)
+thumbnail_cache = ThumbnailCache.from_settings(settings)
+thumbnail_jobs = {}  # thumbnail key -> in-flight render, shared by concurrent requests for it
+pdf_artifacts = PDFArtifactStore.from_settings(settings)  # None: resumes are not pre-rendered on save
+prerender_jobs = {}  # PDF cache key -> in-flight pre-render, awaited by a download that arrives meanwhile
+upload_cache = UploadParseCache.from_settings(settings)  # uploaded file hash -> extracted text / parsed resume
+upload_ingestor = UploadIngestor.from_settings(settings)
+
+
+async def cache_io(method, *args, **kwargs):
+    """
+    Call a method of pdf_cache, thumbnail_cache or upload_cache. With the cache's disk tier on
+    it does file I/O, so it runs in a thread like pdf_artifacts calls; memory-only caches answer inline.
+    """
+    if method.__self__.cache.disk_dir:
+        return await asyncio.to_thread(method, *args, **kwargs)
+    return method(*args, **kwargs)
+
+
+@app.on_event("startup")
+async def warmup_pdf_resources():
+    # Fonts and paragraph styles are shared process-wide; build them before the first download.
+    # Off by default on Lambda, where it would add ReportLab to every cold start.
+    warmup = settings.PDF_WARMUP_ON_STARTUP
+    if warmup is None:
+        warmup = "AWS_LAMBDA_FUNCTION_NAME" not in os.environ
+    if warmup:
+        from services.IconRegistry import IconRegistry
+        from services.PDFStyleRegistry import PDFStyleRegistry
+        from services.ResumeTemplate import ResumeTemplate
+
+        PDFStyleRegistry.warmup()
+        IconRegistry.warmup()
+        ResumeTemplate.get()
+
+
+@app.on_event("shutdown")
+async def shutdown_pdf_render_pool():
+    pdf_render_pool.shutdown()
+    shutdown_pdf_extractor()
+
+
+async def run_render_job(job):
+    """Await a render pool job, mapping pool backpressure and failures to HTTP errors."""
+    try:
+        return await job
+    except RenderPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF renderer is busy, please retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+    except RenderTimeout as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Failed to generate PDF: {str(e)}")
+    except Exception as e:
+        print(f"PDF generation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+
+
+async def render_resume_pdf(resume_data: dict, order: Optional[List[str]] = None, resume_ref=None,
+                            fit_pages: Optional[int] = None, template: Optional[str] = None,
+                            metrics: Optional[RenderMetrics] = None, output: Optional[str] = None) -> bytes:
+    """
+    Render a resume in the PDF worker pool, mapping pool backpressure to HTTP errors.
+    Identical resume content is served from the rendered-PDF cache without re-rendering.
+    Pass `metrics` (or enable PDF_RENDER_METRICS) to have the render instrumented.
+    """
+    cached = await cache_io(pdf_cache.get, resume_data, order, resume_ref, fit_pages, template, output)
+    if cached is None and resume_ref and not (order or fit_pages or template):
+        cached = await load_prerendered_pdf(resume_ref, resume_data, output)
+    if metrics is not None:
+        metrics.cache_hit = cached is not None
+    if cached is not None:
+        return cached
+    if metrics is None and settings.PDF_RENDER_METRICS:
+        metrics = RenderMetrics()
+    if metrics is None:
+        pdf_bytes = await run_render_job(pdf_render_pool.render(resume_data, order, fit_pages, template, output)) or b""
+    else:
+        start = time.perf_counter()
+        pdf_bytes, worker_metrics = await run_render_job(
+            pdf_render_pool.render_with_metrics(resume_data, order, fit_pages, template, output))
+        metrics.merge(worker_metrics)
+        # Time spent waiting for a worker and shipping the job / PDF between processes
+        wall_ms = (time.perf_counter() - start) * 1000
+        worker_ms = metrics.timings.get('total', 0.0) + metrics.timings.get('optimize', 0.0)
+        metrics.timings['queue'] = round(max(wall_ms - worker_ms, 0.0), 3)
+        if settings.PDF_RENDER_METRICS:
+            metrics.log(resume_ref=resume_ref, template=template or None, fit_pages=fit_pages, output=output)
+    await cache_io(pdf_cache.put, resume_data, order, pdf_bytes, resume_ref, fit_pages, template, output)
+    return pdf_bytes
+
+
+async def load_prerendered_pdf(resume_ref, resume_data: dict, output: Optional[str] = None) -> Optional[bytes]:
+    """The PDF pre-rendered when the resume was saved, if it still matches resume_data (waits for one in flight)."""
+    key = RenderedPDFCache.key_for(resume_data, output=output)
+    job = prerender_jobs.get(key)
+    if job is not None:
+        pdf_bytes = await asyncio.shield(job)
+    elif pdf_artifacts is not None:
+        try:
+            pdf_bytes = await asyncio.to_thread(pdf_artifacts.get, *resume_ref, key)
+        except Exception as e:
+            print(f"PDF artifact read failed for {resume_ref}: {e}")
+            return None
+    else:
+        return None
+    if pdf_bytes is not None:
+        await cache_io(pdf_cache.put, resume_data, None, pdf_bytes, resume_ref, output=output)
+    return pdf_bytes
+
+
+async def _prerender_pdf(key: str, user_id: str, resume_id: str, resume_data: dict, output: str) -> Optional[bytes]:
+    try:
+        pdf_bytes = await run_render_job(pdf_render_pool.render(resume_data, output=output))
+        await asyncio.to_thread(pdf_artifacts.put, user_id, resume_id, key, pdf_bytes)
+    except Exception as e:
+        print(f"Pre-render failed for resume {resume_id}: {getattr(e, 'detail', e)}")
+        return None
+    await cache_io(pdf_cache.put, resume_data, None, pdf_bytes, (user_id, resume_id), output=output)
+    return pdf_bytes
+
+
+def schedule_prerender(background_tasks: BackgroundTasks, user_id: str, resume_db):
+    """
+    Write-behind: render a saved resume's PDF after the response is sent and store it for its download.
+    Only for long-lived servers; under Mangum the task would run before the response, so the
+    artifact store (and with it this) is off on AWS Lambda.
+    """
+    if pdf_artifacts is None or not (resume_db.resume_data and resume_db.resume_data.personal_information):
+        return
+    resume_data = resume_db.resume_data.model_dump()
+    output = settings.PDF_DEFAULT_OUTPUT
+    key = RenderedPDFCache.key_for(resume_data, output=output)
+
+    async def prerender():
+        if key in prerender_jobs:
+            return
+        job = prerender_jobs[key] = asyncio.ensure_future(
+            _prerender_pdf(key, user_id, resume_db.resume_id, resume_data, output))
+        job.add_done_callback(lambda _: prerender_jobs.pop(key, None))
+        await job
+
+    background_tasks.add_task(prerender)
+
+
+async def delete_prerendered_pdfs(user_id: str, resume_id: str):
+    try:
+        await asyncio.to_thread(pdf_artifacts.delete, user_id, resume_id)
+    except Exception as e:
+        print(f"Could not delete PDF artifacts of resume {resume_id}: {e}")
+
+
+def server_timing_headers(metrics: Optional[RenderMetrics]) -> Optional[dict]:
+    return {"Server-Timing": metrics.server_timing()} if metrics is not None else None
+
+
+async def page_fit_headers(pdf_bytes: bytes, fit_pages: Optional[int], strict: bool = False) -> dict:
+    """
+    With fit_pages, X-Resume-Pages gives the pages actually served: more than asked for when even
+    the tightest layout did not fit. A strict request gets a 422 instead of the longer PDF.
+    """
+    if not fit_pages:
+        return {}
+    pages = await asyncio.to_thread(pdf_page_count, pdf_bytes)
+    if pages > fit_pages and strict:
+        raise HTTPException(
+            status_code=422,
+            detail=f"The resume takes {pages} pages even at the tightest layout; {fit_pages} requested.",
+            headers={"X-Resume-Pages": str(pages)}
+        )
+    return {"X-Resume-Pages": str(pages)}
+
+
+def check_template(template: Optional[str]):
+    from services.ResumeTemplate import ResumeTemplate
+
+    if template and template not in ResumeTemplate.available():
+        raise HTTPException(status_code=400, detail=f"Unknown template: {template!r}")
+
+
+async def _make_thumbnail(key: str, resume_data: dict, width: int, resume_ref,
+                          order: Optional[List[str]] = None, template: Optional[str] = None) -> bytes:
+    # The PDF is looked up and kept in the output mode the download endpoints serve by default
+    output = settings.PDF_DEFAULT_OUTPUT
+    pdf_bytes = await cache_io(pdf_cache.get, resume_data, order, resume_ref, template=template, output=output)
+    if pdf_bytes is not None:
+        png_bytes = await run_render_job(pdf_render_pool.rasterize(pdf_bytes, width))
+    else:
+        # Render and rasterize in one pool job; keep the PDF too, a download often follows
+        pdf_bytes, png_bytes = await run_render_job(
+            pdf_render_pool.thumbnail(resume_data, width, order, template, output))
+        await cache_io(pdf_cache.put, resume_data, order, pdf_bytes, resume_ref, template=template, output=output)
+    await cache_io(thumbnail_cache.put, key, png_bytes)
+    return png_bytes
+
+
+async def render_resume_thumbnail(resume_data: dict, width: int = DEFAULT_THUMBNAIL_WIDTH, resume_ref=None,
+                                  order: Optional[List[str]] = None, template: Optional[str] = None):
+    """
+    First-page PNG of a resume as (cache key, png bytes), cached by content hash.
+    Concurrent requests for the same thumbnail share one render.
+    """
+    key = ThumbnailCache.key_for(resume_data, width, order, template)
+    png_bytes = await cache_io(thumbnail_cache.get, key)
+    if png_bytes is not None:
+        return key, png_bytes
+    job = thumbnail_jobs.get(key)
+    if job is None:
+        job = thumbnail_jobs[key] = asyncio.ensure_future(
+            _make_thumbnail(key, resume_data, width, resume_ref, order, template))
+        job.add_done_callback(lambda _: thumbnail_jobs.pop(key, None))
+    # shield: a client going away must not cancel a render other requests are waiting on
+    return key, await asyncio.shield(job)
+
+
+def thumbnail_prefetch_limit() -> int:
+    limit = settings.THUMBNAIL_PREFETCH_LIMIT
+    if limit is None:
+        # Under Mangum background tasks run before the response is returned: off on Lambda
+        limit = 0 if "AWS_LAMBDA_FUNCTION_NAME" in os.environ else 20
+    return limit
+
+
+# One prefetch render at a time per process, however many list requests ask for one
+thumbnail_prefetch_slot = asyncio.Lock()
+
+
+async def warm_thumbnails(user_id: str, resume_ids: List[str], width: int = DEFAULT_THUMBNAIL_WIDTH):
+    """
+    Warm the thumbnail cache for a user's resume list, one render at a time and only while a
+    render worker is idle: prefetching never queues behind, or crowds out, real renders.
+    """
+    resumes, _ = await crud.get_resumes_by_ids(user_id=user_id, resume_ids=resume_ids)
+    async with thumbnail_prefetch_slot:
+        for resume_db in resumes:
+            if not (resume_db.resume_data and resume_db.resume_data.personal_information):
+                continue
+            if pdf_render_pool.pending >= pdf_render_pool.max_workers:
+                print(f"Thumbnail prefetch for user {user_id} stopped: the PDF renderer is busy.")
+                return
+            try:
+                await render_resume_thumbnail(resume_db.resume_data.model_dump(), width,
+                                              resume_ref=(user_id, resume_db.resume_id))
+            except HTTPException as e:
+                print(f"Thumbnail prefetch skipped for {resume_db.resume_id}: {e.detail}")
+
+
+def pdf_filename(title: Optional[str]) -> str:
+    safe_title = "".join(c if c.isalnum() or c in (' ', '.', '-') else '_' for c in (title or "resume"))
+    return f"{safe_title.replace(' ', '_')}.pdf"
+
 # --- Routers ---
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
 user_router = APIRouter(prefix="/users", tags=["Users"])
@@ -193,10 +466,33 @@ async def get_metadata_endpoint(env: str = Header(None)):
     return result
 
 
+async def parse_uploaded_resume(upload: SpooledUpload) -> dict:
+    """Extract the text of an uploaded file (cached per file) and have the LLM parse it into resume JSON."""
+    from services.ResumeBuilder import ResumeBuilder
+    from utils.FileOperations import FileOperations
+
+    try:
+        text = await cache_io(upload_cache.get_text, upload.digest)
+        if text is None:
+            # Long PDFs fan out to the extraction pool; keep the event loop free meanwhile
+            text = await asyncio.to_thread(FileOperations().extract_text_from_file_bytes, upload.data(),
+                                           upload.filename, upload.file_type)
+            if not text:
+                raise HTTPException(status_code=400, detail="Could not extract text from the uploaded file.")
+            await cache_io(upload_cache.put_text, upload.digest, text)
+        return ResumeBuilder('google').parse_file_to_json(text)
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"LLM parsing error: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to parse resume with LLM: {str(e)}")
+
+
 # --- Resume Endpoints (Nested under /users/{user_id}/resumes) ---
 @resume_router.post("/users/{user_id}/resumes/upload-and-create", response_model=ResumePublic,
                     status_code=status.HTTP_201_CREATED)
 async def upload_resume_file_and_create_for_user(
+        background_tasks: BackgroundTasks,
         user_id: str = Path(..., description="The ID of the user"),
         current_user=Depends(auth.get_current_user),
         title: Annotated[str, Form()] = "Uploaded Resume",
@@ -210,37 +506,45 @@ async def upload_resume_file_and_create_for_user(
     if not resume_file.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
 
-    contents = await resume_file.read()
-    filename = resume_file.filename
+    # Size cap and real file type (magic bytes) are checked as the file is read, so a legacy .doc,
+    # an image or an oversized file costs neither extraction nor an LLM call
     try:
-        text = FileOperations().extract_text_from_file_bytes(contents, filename)
-        if not text:
-            raise HTTPException(status_code=400, detail="Could not extract text from the uploaded file.")
-        print(f"Extracted text from file: {text[:100]}...")  # Log first 100 chars for debugging
-        resume_builder = ResumeBuilder('google')
-
-        # TODO : Implement the actual LLM parsing logic here
-
-        parsed_resume_pydantic: ResumeSchema = resume_builder.parse_file_to_json(
-            text)  # Assuming this function exists and returns a ResumeSchema object
-    except Exception as e:
-        print(f"LLM parsing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to parse resume with LLM: {str(e)}")
-    parsed_resume_pydantic = clean_none_strings(parsed_resume_pydantic)
-    resume_to_create = ResumeCreate(title=title, resume_data=parsed_resume_pydantic)
+        upload = await upload_ingestor.ingest(resume_file)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    with upload:
+        filename = upload.filename
+        digest = upload.digest
+        # The same file uploaded again: reuse its parse and skip both extraction and the LLM call
+        parsed_resume = await cache_io(upload_cache.get_parsed, digest)
+        cached = parsed_resume is not None
+        if cached:
+            print(f"Upload cache hit for {filename} ({digest[:12]})")
+        else:
+            parsed_resume = await parse_uploaded_resume(upload)
+    resume_to_create = ResumeCreate(title=title, resume_data=clean_none_strings(parsed_resume))
+    if not cached:
+        await cache_io(upload_cache.put_parsed, digest, parsed_resume)
 
     created_resume_db = await crud.create_resume(user_id=user_id, resume_in=resume_to_create)
     if not created_resume_db:
         raise HTTPException(status_code=500, detail="Could not save parsed resume.")
+    schedule_prerender(background_tasks, user_id, created_resume_db)
     return ResumePublic.model_validate(created_resume_db.model_dump())
 
 
 @resume_router.get("/users/{user_id}/resumes", response_model=List[ResumePublic])
-async def get_list_of_user_resumes_endpoint( user_id: str = Path(..., description="The ID of the user"),x_requried_data: Optional[bool] = Header(False),current_user=Depends(auth.get_current_user)):
+async def get_list_of_user_resumes_endpoint( background_tasks: BackgroundTasks, user_id: str = Path(..., description="The ID of the user"),x_requried_data: Optional[bool] = Header(False),current_user=Depends(auth.get_current_user),
+        prefetch_thumbnails: int = Query(0, ge=0, description="Pre-render the thumbnails of this many of the most recent resumes")):
     user = await crud.get_user_by_id(user_id)  # Optional: check if user exists
     if not user:
         raise HTTPException(status_code=404, detail=f"User with id {user_id} not found.")
     resumes_db_list = await crud.get_all_resumes_for_user(user_id=user_id,x_requried_data=x_requried_data)
+    prefetch = min(prefetch_thumbnails, thumbnail_prefetch_limit())
+    if prefetch and resumes_db_list:
+        # The client shows these thumbnails next; start rendering them now (most recent first)
+        recent_ids = [r.resume_id for r in resumes_db_list[:prefetch]]
+        background_tasks.add_task(warm_thumbnails, user_id, recent_ids)
     return [ResumePublic.model_validate(r.model_dump()) for r in resumes_db_list]
 
 
@@ -259,6 +563,7 @@ async def get_one_user_resume_json_endpoint(
 # For updating an existing resume (PUT)
 @resume_router.put("/users/{user_id}/resumes/{resume_id}", response_model=ResumePublic)
 async def update_user_resume_endpoint(
+    background_tasks: BackgroundTasks,
     resume_update_payload: ResumeUpdate = Body(...),  # Expecting a ResumeUpdate payload with resume_data
     user_id: str = Path(..., description="The ID of the user"),
     current_user=Depends(auth.get_current_user),
@@ -270,11 +575,14 @@ async def update_user_resume_endpoint(
     )
     if not updated_resume_db:
         raise HTTPException(status_code=404, detail="Resume not found or failed to update")
+    await cache_io(pdf_cache.invalidate_resume, user_id, resume_id)
+    schedule_prerender(background_tasks, user_id, updated_resume_db)
     return ResumePublic.model_validate(updated_resume_db.model_dump())
 
 # For creating a new resume (POST)
 @resume_router.post("/users/{user_id}/resumes", response_model=ResumePublic)
 async def create_user_resume_endpoint(
+    background_tasks: BackgroundTasks,
     resume_update_payload: ResumeUpdate = Body(...),  # Expecting a ResumeUpdate payload with resume_data
     user_id: str = Path(..., description="The ID of the user"),
     current_user=Depends(auth.get_current_user),
@@ -287,11 +595,13 @@ async def create_user_resume_endpoint(
     created_resume_db = await crud.create_resume(user_id=user_id, resume_in=resume_to_create)
     if not created_resume_db:
         raise HTTPException(status_code=500, detail="Could not create new resume.")
+    schedule_prerender(background_tasks, user_id, created_resume_db)
     return ResumePublic.model_validate(created_resume_db.model_dump())
 
 @resume_router.post("/users/{user_id}/resumes/{resume_id}/tailor", response_model=ResumePublic)
 async def tailor_resume_for_job_endpoint(
         job_details: JobDetailsInput,
+        background_tasks: BackgroundTasks,
         user_id: str = Path(..., description="The ID of the user"),
         current_user=Depends(auth.get_current_user),
         resume_id: str = Path(..., description="The ID of the resume")
@@ -300,6 +610,9 @@ async def tailor_resume_for_job_endpoint(
     if not existing_resume_db:
         raise HTTPException(status_code=404, detail="Resume to tailor not found for this user")
 
+    from services.ResumeBuilder import ResumeBuilder
+    from utils.WebScraper import WebScraper
+
     existing_resume_pydantic = existing_resume_db.resume_data
     try:
         # Prepare job details object: if job_description is present, use its text; if job_link is present, fetch description from link
@@ -329,6 +642,8 @@ async def tailor_resume_for_job_endpoint(
             )
             if not updated_resume_db:
                 raise HTTPException(status_code=500, detail="Failed to update existing resume with tailored data.")
+            await cache_io(pdf_cache.invalidate_resume, user_id, resume_id)
+            schedule_prerender(background_tasks, user_id, updated_resume_db)
             tailored_resume = ResumePublic.model_validate(updated_resume_db.model_dump())
         else:
             # Create a new resume version with the tailored data
@@ -341,6 +656,7 @@ async def tailor_resume_for_job_endpoint(
             created_resume_db = await crud.create_resume(user_id=user_id, resume_in=new_resume_to_create)
             if not created_resume_db:
                 raise HTTPException(status_code=500, detail="Failed to create new tailored resume.")
+            schedule_prerender(background_tasks, user_id, created_resume_db)
             tailored_resume = ResumePublic.model_validate(created_resume_db.model_dump())
 
     except Exception as e:
@@ -349,61 +665,251 @@ async def tailor_resume_for_job_endpoint(
     return tailored_resume
 
 
+@resume_router.get("/templates")
+async def list_resume_templates(current_user=Depends(auth.get_current_user)):
+    """Visual templates a resume can be downloaded in."""
+    from services.ResumeTemplate import ResumeTemplate
+
+    return [{"name": name, "description": ResumeTemplate.get(name).description} for name in ResumeTemplate.available()]
+
 @resume_router.get("/users/{user_id}/resumes/{resume_id}/download", response_class=StreamingResponse)
 async def download_resume_as_pdf(
         user_id: str = Path(..., description="The ID of the user"),
         current_user=Depends(auth.get_current_user),
-        resume_id: str = Path(..., description="The ID of the resume")
+        resume_id: str = Path(..., description="The ID of the resume"),
+        range: Optional[str] = Header(None, description="Optional byte range, e.g. bytes=0-65535"),
+        fit_pages: Optional[int] = Query(None, ge=1, le=10, description="Tighten spacing and fonts to fit this many pages"),
+        fit_strict: bool = Query(False, description="422 instead of a longer PDF when fit_pages cannot be met"),
+        template: Optional[str] = Query(None, description="Visual template, see /templates; classic if omitted"),
+        output: Optional[str] = Query(None, pattern="^(standard|web)$",
+                                      description="web: smaller PDF (re-subset fonts, object streams) for slow connections")
 ):
+    check_template(template)
     resume_db = await crud.get_resume_by_id(user_id=user_id, resume_id=resume_id)
     if not resume_db:
         raise HTTPException(status_code=404, detail="Resume not found for download by this user")
 
-    try:
-        # TODO : Implement the actual PDF generation logic here
-        pdf_bytes: bytes = JsonToPDFBuilder().build(resume_db.resume_data.model_dump()) or b""   # Assuming this function exists and returns bytes
-    except Exception as e:
-        print(f"PDF generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+    metrics = RenderMetrics() if settings.PDF_SERVER_TIMING else None
+    pdf_bytes: bytes = await render_resume_pdf(resume_db.resume_data.model_dump(), resume_ref=(user_id, resume_id),
+                                                fit_pages=fit_pages, template=template, metrics=metrics,
+                                                output=output or settings.PDF_DEFAULT_OUTPUT)
+    headers = await page_fit_headers(pdf_bytes, fit_pages, fit_strict)
+    headers.update(server_timing_headers(metrics) or {})
 
-    safe_title = "".join(c if c.isalnum() or c in (' ', '.', '-') else '_' for c in (resume_db.title or "resume"))
-    filename = f"{safe_title.replace(' ', '_')}.pdf"
+    return pdf_response(pdf_bytes, pdf_filename(resume_db.title), range_header=range, extra_headers=headers)
 
-    return StreamingResponse(
-        io.BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
-    )
+@resume_router.get("/users/{user_id}/resumes/{resume_id}/thumbnail.png", response_class=Response)
+async def get_resume_thumbnail(
+        user_id: str = Path(..., description="The ID of the user"),
+        current_user=Depends(auth.get_current_user),
+        resume_id: str = Path(..., description="The ID of the resume"),
+        width: int = Query(DEFAULT_THUMBNAIL_WIDTH, ge=32, le=MAX_THUMBNAIL_WIDTH, description="Width in pixels"),
+        if_none_match: Optional[str] = Header(None)
+):
+    resume_db = await crud.get_resume_by_id(user_id=user_id, resume_id=resume_id)
+    if not resume_db or not (resume_db.resume_data and resume_db.resume_data.personal_information):
+        raise HTTPException(status_code=404, detail="Resume not found for thumbnail by this user")
+
+    resume_data = resume_db.resume_data.model_dump()
+    etag = f'"{ThumbnailCache.key_for(resume_data, width)}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    _, png_bytes = await render_resume_thumbnail(resume_data, width, resume_ref=(user_id, resume_id))
+    return Response(content=png_bytes, media_type="image/png", headers=headers)
 
 @resume_router.post("/users/{user_id}/resumes/onfly.download", response_class=StreamingResponse)
 async def onfly_download_resume_as_pdf(
         resume_payload:ResumeUpdate = Body(...),  # Expecting a ResumeUpdate payload with resume_data
         user_id: str = Path(..., description="The ID of the user"),
         current_user=Depends(auth.get_current_user),
-        
-        
+        range: Optional[str] = Header(None, description="Optional byte range, e.g. bytes=0-65535"),
+        fit_pages: Optional[int] = Query(None, ge=1, le=10, description="Tighten spacing and fonts to fit this many pages"),
+        fit_strict: bool = Query(False, description="422 instead of a longer PDF when fit_pages cannot be met"),
+        template: Optional[str] = Query(None, description="Visual template, see /templates; classic if omitted"),
+        output: Optional[str] = Query(None, pattern="^(standard|web)$",
+                                      description="web: smaller PDF (re-subset fonts, object streams) for slow connections")
 ):
+    check_template(template)
     if not resume_payload or not resume_payload.resume_data:
         raise HTTPException(status_code=404, detail="No resume data found for download")
 
+    metrics = RenderMetrics() if settings.PDF_SERVER_TIMING else None
+    pdf_bytes: bytes = await render_resume_pdf(resume_payload.resume_data.model_dump(), fit_pages=fit_pages,
+                                                template=template, metrics=metrics,
+                                                output=output or settings.PDF_DEFAULT_OUTPUT)
+    headers = await page_fit_headers(pdf_bytes, fit_pages, fit_strict)
+    headers.update(server_timing_headers(metrics) or {})
+
+    return pdf_response(pdf_bytes, pdf_filename(resume_payload.title), range_header=range, extra_headers=headers)
+
+@resume_router.post("/users/{user_id}/resumes/onfly.preview", response_class=HTMLResponse)
+async def onfly_preview_resume_as_html(
+        resume_payload: ResumeUpdate = Body(...),
+        user_id: str = Path(..., description="The ID of the user"),
+        current_user=Depends(auth.get_current_user),
+        order: Optional[List[str]] = Query(None, description="Section order; the PDF default order if omitted"),
+        template: Optional[str] = Query(None, description="Visual template, see /templates; classic if omitted")
+):
+    """Fast HTML preview for the editor: the PDF's template, sections and order, without the PDF layout cost."""
+    check_template(template)
+    if not resume_payload or not resume_payload.resume_data:
+        raise HTTPException(status_code=404, detail="No resume data found for preview")
+    from services.ResumeHTMLBuilder import ResumeHTMLBuilder
+
     try:
-        # TODO : Implement the actual PDF generation logic here
-        pdf_bytes: bytes = JsonToPDFBuilder().build(resume_payload.resume_data.model_dump()) or b""   # Assuming this function exists and returns bytes
-    except Exception as e:
-        print(f"PDF generation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(e)}")
+        html = ResumeHTMLBuilder(template).build_page(resume_payload.resume_data.model_dump(), order,
+                                                      resume_payload.title)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return HTMLResponse(html)
 
-    safe_title = "".join(c if c.isalnum() or c in (' ', '.', '-') else '_' for c in (resume_payload.title or "resume"))
-    filename = f"{safe_title.replace(' ', '_')}.pdf"
+@resume_router.post("/users/{user_id}/resumes/onfly.gallery", response_class=StreamingResponse)
+async def onfly_resume_gallery(
+        gallery: GalleryRequest = Body(...),
+        user_id: str = Path(..., description="The ID of the user"),
+        current_user=Depends(auth.get_current_user),
+        width: int = Query(DEFAULT_THUMBNAIL_WIDTH, ge=32, le=MAX_THUMBNAIL_WIDTH, description="Thumbnail width in pixels"),
+        include_pdf: bool = Query(False, description="Also send each variant's PDF (base64)")
+):
+    """
+    Preview one resume in several templates / section orders. Variants are rendered
+    concurrently in the PDF worker pool and streamed as NDJSON, one line per variant
+    in completion order, so the gallery fills in as fast as the pool allows.
+    """
+    from services.JsonToPDFBuilder import DEFAULT_SECTION_ORDER
+    from services.ResumeTemplate import ResumeTemplate
+
+    if not gallery.resume_data.personal_information:
+        raise HTTPException(status_code=400, detail="personal_information is required to render a resume")
+    variants = gallery.variants or [GalleryVariant(template=name) for name in ResumeTemplate.available()]
+    for variant in variants:
+        check_template(variant.template)
+        unknown = set(variant.order or []) - set(DEFAULT_SECTION_ORDER)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown section key(s): {sorted(unknown)}")
+
+    resume_data = gallery.resume_data.model_dump()
+    slots = asyncio.Semaphore(pdf_render_pool.max_workers)
+    start = time.perf_counter()
+
+    async def render_variant(index: int, variant: GalleryVariant):
+        line = {"index": index, "template": variant.template, "order": variant.order}
+        async with slots:
+            try:
+                _, png_bytes = await render_resume_thumbnail(resume_data, width, order=variant.order,
+                                                             template=variant.template)
+                line["thumbnail"] = "data:image/png;base64," + base64.b64encode(png_bytes).decode("ascii")
+                if include_pdf:
+                    pdf_bytes = await render_resume_pdf(resume_data, variant.order, template=variant.template,
+                                                        output=settings.PDF_DEFAULT_OUTPUT)
+                    line["pdf"] = base64.b64encode(pdf_bytes).decode("ascii")
+            except HTTPException as e:
+                line["error"] = e.detail
+        line["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return line
+
+    async def ndjson_lines():
+        tasks = [asyncio.ensure_future(render_variant(i, v)) for i, v in enumerate(variants)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield json.dumps(await next_done) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+@resume_router.get("/users/{user_id}/resumes.export", response_class=StreamingResponse)
+async def export_resumes_as_zip(
+        user_id: str = Path(..., description="The ID of the user"),
+        current_user=Depends(auth.get_current_user),
+        resume_ids: Optional[List[str]] = Query(None, description="Resumes to export; all of the user's resumes if omitted")
+):
+    """
+    Stream a ZIP of the user's resumes as PDFs. Resumes are fetched in one batch,
+    rendered in parallel by one task per render worker and written to the archive in
+    completion order. Finished PDFs wait in a queue of one per worker, so a slow
+    client pauses the renders instead of letting PDFs pile up: peak memory stays
+    bounded whatever the number of resumes. Every requested resume that is not in the
+    archive (not found, not fetched, nothing to render, failed) is listed in errors.txt.
+    """
+    errors = []
+    if resume_ids:
+        resumes, unprocessed = await crud.get_resumes_by_ids(user_id=user_id, resume_ids=resume_ids)
+        fetched = {r.resume_id for r in resumes}
+        for rid in dict.fromkeys(resume_ids):
+            if rid in unprocessed:
+                errors.append(f"{rid}: could not be fetched (database busy), export it again")
+            elif rid not in fetched:
+                errors.append(f"{rid}: not found")
+    else:
+        resumes = await crud.get_all_resumes_for_user(user_id=user_id, x_requried_data=True)
+        unprocessed = []
+    for r in resumes:
+        if not (r.resume_data and r.resume_data.personal_information):
+            errors.append(f"{r.resume_id} ({r.title}): no personal information, nothing to render")
+    resumes = [r for r in resumes if r.resume_data and r.resume_data.personal_information]
+    if not resumes:
+        if unprocessed:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="Resumes could not be fetched, please retry shortly.",
+                                headers={"Retry-After": "1"})
+        raise HTTPException(status_code=404, detail="No resumes found for export by this user")
+
+    workers = min(pdf_render_pool.max_workers, len(resumes))
+
+    async def render_all(todo, rendered: asyncio.Queue):
+        # The iterator is shared by the workers: each resume is taken by exactly one of them
+        for resume_db in todo:
+            try:
+                pdf = await render_resume_pdf(resume_db.resume_data.model_dump(),
+                                              resume_ref=(user_id, resume_db.resume_id),
+                                              output=settings.PDF_DEFAULT_OUTPUT)
+                await rendered.put((resume_db, pdf, None))
+            except HTTPException as e:
+                await rendered.put((resume_db, None, e.detail))
+            except Exception as e:
+                await rendered.put((resume_db, None, str(e)))
+
+    async def zip_chunks():
+        todo = iter(resumes)
+        rendered = asyncio.Queue(maxsize=workers)
+        tasks = [asyncio.ensure_future(render_all(todo, rendered)) for _ in range(workers)]
+        writer = ZipStreamWriter()
+        used_names = set()
+        try:
+            for _ in range(len(resumes)):
+                resume_db, pdf, error = await rendered.get()
+                if error:
+                    errors.append(f"{resume_db.resume_id} ({resume_db.title}): {error}")
+                    continue
+                name = pdf_filename(resume_db.title)
+                if name in used_names:
+                    name = f"{name[:-4]}_{resume_db.resume_id[:8]}.pdf"
+                used_names.add(name)
+                for chunk in writer.add(name, pdf):
+                    yield chunk
+                pdf = None  # written out: drop it before waiting for the next one
+            if errors:
+                for chunk in writer.add("errors.txt", "\n".join(errors).encode("utf-8")):
+                    yield chunk
+            for chunk in writer.close():
+                yield chunk
+        finally:
+            for task in tasks:
+                task.cancel()
 
     return StreamingResponse(
-        io.BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=\"{filename}\""}
+        zip_chunks(),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=\"resumes.zip\""}
     )
 
 @resume_router.delete("/users/{user_id}/resumes/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resume_endpoint(
+        background_tasks: BackgroundTasks,
         user_id: str = Path(..., description="The ID of the user"),
         current_user=Depends(auth.get_current_user),
         resume_id: str = Path(..., description="The ID of the resume")
@@ -411,6 +917,9 @@ async def delete_resume_endpoint(
     deleted = await crud.delete_resume(user_id=user_id, resume_id=resume_id)
     if not deleted:  # crud.delete_resume now returns False if ConditionalCheckFailed (item not found)
         raise HTTPException(status_code=404, detail="Resume not found or failed to delete")
+    await cache_io(pdf_cache.invalidate_resume, user_id, resume_id)
+    if pdf_artifacts is not None:
+        background_tasks.add_task(delete_prerendered_pdfs, user_id, resume_id)
     return None
 
 
@@ -462,6 +971,7 @@ async def scrape_linkedin_job_endpoint(
         scraping_url = f"https://www.linkedin.com/jobs/view/{job_id}"
         
         # Use WebScraper to get job details
+        from utils.WebScraper import WebScraper
         web_scraper = WebScraper()
         scraped_data = web_scraper.linkedin_scrape_job_details(scraping_url)
         
@@ -0,0 +1,109 @@
+"""
+Cold-start import profile and budget check for the Lambda entry point.
+
+Run from the repository root:
+    python -m benchmarks.cold_import [--runs 5] [--budget-ms 1500] [--top 15]
+                                     [--module app] [--output report.json]
+
+Imports `--module` in fresh interpreters under `python -X importtime` and reports:
+  - median / max wall time of the import over --runs cold processes;
+  - the slowest top-level packages (summed self time) and the slowest modules
+    (cumulative time) of the median run;
+  - which of the lazily loaded libraries (ReportLab, PyMuPDF, python-docx,
+    openai, BeautifulSoup / lxml, Pillow) were pulled in by the import anyway.
+Exits with status 1 when the median exceeds the budget (COLD_IMPORT_BUDGET_MS
+by default) or a lazy library was imported, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from core.config import settings
+
+# Only the routes that render, parse or scrape may import these
+LAZY_LIBRARIES = ['reportlab', 'fitz', 'pymupdf', 'docx', 'openai', 'bs4', 'lxml', 'PIL']
+
+PROBE = (
+    "import importlib, json, sys, time\n"
+    "start = time.perf_counter()\n"
+    "importlib.import_module(sys.argv[1])\n"
+    "elapsed = (time.perf_counter() - start) * 1000\n"
+    "print(json.dumps({'ms': elapsed, 'lazy_loaded': [m for m in sys.argv[2:] if m in sys.modules]}))\n"
+)
+
+
+def parse_importtime(stderr: str):
+    """[(module, self_us, cumulative_us)] from `-X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def cold_import(module: str):
+    env = dict(os.environ, PYTHONPATH=os.getcwd() + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE, module, *LAZY_LIBRARIES],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['modules'] = parse_importtime(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app", help="module whose cold import is measured")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=settings.COLD_IMPORT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    runs = sorted((cold_import(args.module) for _ in range(args.runs)), key=lambda r: r['ms'])
+    median = runs[len(runs) // 2]
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in median['modules']:
+        by_package[name.split('.')[0]] += self_us
+    slowest_packages = sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+    slowest_modules = sorted(median['modules'], key=lambda row: row[2], reverse=True)[:args.top]
+    lazy_loaded = sorted({m for run in runs for m in run['lazy_loaded']})
+
+    median_ms = statistics.median(r['ms'] for r in runs)
+    report = {
+        "module": args.module,
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "median_ms": round(median_ms, 1),
+        "max_ms": round(runs[-1]['ms'], 1),
+        "budget_ms": args.budget_ms,
+        "within_budget": median_ms <= args.budget_ms,
+        "lazy_libraries_loaded": lazy_loaded,
+        "slowest_packages_ms": {name: round(us / 1000, 1) for name, us in slowest_packages},
+        "slowest_modules_cumulative_ms": {name: round(cum / 1000, 1) for name, _, cum in slowest_modules},
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if not report["within_budget"]:
+        print(f"FAIL: cold import of {args.module} took {median_ms:.0f}ms, budget is {args.budget_ms:.0f}ms")
+        sys.exit(1)
+    if lazy_loaded:
+        print(f"FAIL: importing {args.module} loaded {', '.join(lazy_loaded)}; import them where they are used")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Concurrency stress check for the reentrant JsonToPDFBuilder.
+
+Run from the repository root:
+    python -m benchmarks.concurrency_stress [--resumes 40] [--threads 16]
+
+Renders many different resumes serially, then renders them all again in
+parallel through ONE shared builder, and exits non-zero unless every
+parallel output is byte-identical to its serial render.
+"""
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+
+
+def make_variants(base, count, seed=7):
+    """Distinct resumes derived from `base`: reordered sections, trimmed lists, edited text."""
+    rng = random.Random(seed)
+    variants = []
+    for i in range(count):
+        data = copy.deepcopy(base)
+        data['summary'] = f"{data.get('summary') or ''} Variant {i}."
+        for field in ('experiences', 'projects', 'education', 'skills'):
+            items = data.get(field) or []
+            if items:
+                data[field] = rng.sample(items, rng.randint(1, len(items))) * rng.randint(1, 3)
+        order = list(DEFAULT_SECTION_ORDER[1:])
+        rng.shuffle(order)
+        variants.append((data, ['personal_info'] + order))
+    return variants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=40)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--input", default="data/sample.json")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    variants = make_variants(base, args.resumes)
+    builder = JsonToPDFBuilder()
+
+    start = time.perf_counter()
+    serial = [builder.build(data, order, invariant=True) for data, order in variants]
+    serial_s = time.perf_counter() - start
+
+    JsonToPDFBuilder.section_cache.clear()  # make threads race on cold section entries too
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        parallel = list(pool.map(lambda v: builder.build(v[0], v[1], invariant=True), variants * 2))
+    parallel_s = time.perf_counter() - start
+
+    mismatches = [i for i, pdf in enumerate(parallel) if pdf != serial[i % len(serial)]]
+    print(json.dumps({
+        "resumes": len(variants),
+        "parallel_renders": len(parallel),
+        "threads": args.threads,
+        "serial_s": round(serial_s, 3),
+        "parallel_s": round(parallel_s, 3),
+        "mismatches": mismatches,
+    }, indent=2))
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Entry header layout: services.EntryHeader vs. the per-entry 2x2 Table it replaced.
+
+Run from the repository root:
+    python -m benchmarks.entry_headers [--entries 30 60 120] [--iterations 20]
+                                       [--output results.json]
+
+For each entry count it lays out a document of that many entry headers (title /
+date over subtitle / location, fresh paragraphs every iteration so nothing is
+memoized) once with `table` (Table + TableStyle per entry, as before) and once
+with `flowable` (EntryHeader), and reports:
+  - latency (p50 / p95) of creating the headers and laying out / writing the PDF,
+    paragraph parsing excluded since both share it;
+  - memory held by the header objects (`headers_kb`) and the peak Python heap
+    of doc.build (`build_peak_kb`), from tracemalloc;
+  - the speedup and whether both lay out to the same pages (`identical`,
+    rasterized with PyMuPDF).
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+from benchmarks.output_modes import pages_identical
+from benchmarks.render_suite import percentile
+from services.EntryHeader import EntryHeader
+from services.JsonToPDFBuilder import JsonToPDFBuilder, PDFSink
+from services.PDFStyleRegistry import PDFStyleRegistry
+from services.SectionFlowableCache import MemoParagraph
+
+HEADER = [
+    ('<b>Senior Software Engineer {i}</b>', 'ExpTitle'),
+    ('Jan 2020 – Present', 'ExpDate'),
+    ('<i>Example Corporation {i}</i>', 'ExpRole'),
+    ('San Francisco, CA', 'ExpLoc'),
+]
+
+
+def legacy_table(cells, columns):
+    table = Table([cells[:2], cells[2:]], colWidths=columns)
+    table.setStyle(TableStyle([
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ]))
+    return table
+
+
+def entry_header(cells, columns):
+    return EntryHeader(((cells[0], cells[1]), (cells[2], cells[3])), columns)
+
+
+LAYOUTS = {'table': legacy_table, 'flowable': entry_header}
+
+
+def new_doc(sink):
+    return SimpleDocTemplate(sink, pagesize=letter, leftMargin=0.3 * inch, rightMargin=0.3 * inch,
+                             topMargin=0.3 * inch, bottomMargin=0.3 * inch)
+
+
+def paragraphs(entries: int, styles):
+    return [[MemoParagraph(text.format(i=i), styles[style]) for text, style in HEADER] for i in range(entries)]
+
+
+def build(story) -> bytes:
+    sink = PDFSink()
+    new_doc(sink).build(story)
+    return sink.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[30, 60, 120])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    styles = PDFStyleRegistry.get_styles()
+    columns = JsonToPDFBuilder().calculateTableColumnSplit(new_doc(PDFSink()))
+    results = {}
+    for entries in args.entries:
+        pdfs = {name: build([make(cells, columns) for cells in paragraphs(entries, styles)])
+                for name, make in LAYOUTS.items()}  # also warms up
+        report = {}
+        for name, make in LAYOUTS.items():
+            samples = []
+            for _ in range(args.iterations):
+                cells = paragraphs(entries, styles)
+                start = time.perf_counter()
+                build([make(c, columns) for c in cells])
+                samples.append((time.perf_counter() - start) * 1000)
+            cells = paragraphs(entries, styles)
+            tracemalloc.start()
+            story = [make(c, columns) for c in cells]
+            story_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            build(story)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            report[name] = {
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "headers_kb": round(story_bytes / 1024, 1),
+                "build_peak_kb": round(peak / 1024, 1),
+            }
+        report["speedup"] = round(report['table']['p50_ms'] / report['flowable']['p50_ms'], 2)
+        report["identical"] = pages_identical(pdfs['table'], pdfs['flowable'])
+        results[entries] = report
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Latency of fit-to-pages renders vs. normal renders.
+
+Run from the repository root:
+    python -m benchmarks.fit_latency [--iterations 10]
+
+For each synthetic profile and page target, every render uses new content (so
+nothing is served from the section cache) and reports the normal build time,
+the fit build time and the page count actually produced.
+"""
+import argparse
+import json
+import statistics
+import time
+
+import fitz
+
+from benchmarks.synthetic_resume import load_seed, generate_profile
+from services.JsonToPDFBuilder import JsonToPDFBuilder
+
+CASES = [('small', 1), ('medium', 1), ('large', 2), ('large', 3), ('xlarge', 4), ('xlarge', 5)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--input", default="data/sample.json", help="seed resume")
+    args = parser.parse_args()
+
+    seed = load_seed(args.input)
+    builder = JsonToPDFBuilder()
+    builder.build(generate_profile(seed, 'small', salt=" #warmup"), fit_pages=1)
+
+    results = []
+    for profile, pages in CASES:
+        normal, fit, produced = [], [], None
+        for i in range(args.iterations):
+            normal.append(timed(lambda: builder.build(generate_profile(seed, profile, salt=f" #n{i}")))[0])
+            ms, pdf_bytes = timed(lambda: builder.build(generate_profile(seed, profile, salt=f" #f{i}"),
+                                                        fit_pages=pages))
+            fit.append(ms)
+            with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+                produced = doc.page_count
+        results.append({
+            "profile": profile,
+            "fit_pages": pages,
+            "pages_produced": produced,
+            "normal_p50_ms": round(statistics.median(normal), 2),
+            "fit_p50_ms": round(statistics.median(fit), 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Render latency vs. number of unchanged sections (section paragraph memoization).
+
+Run from the repository root:
+    python -m benchmarks.incremental_render [--iterations 20]
+
+For each u in 0..N, the first u sections of the default order keep their content
+and the remaining ones are edited before every render, so only the edited
+sections miss JsonToPDFBuilder.section_cache.
+"""
+import argparse
+import copy
+import json
+import statistics
+import time
+
+from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+
+# section key -> key in resume JSON
+SECTION_FIELDS = {
+    'personal_info': 'personal_information',
+    'summary': 'summary',
+    'education': 'education',
+    'experiences': 'experiences',
+    'skills': 'skills',
+    'certifications': 'certifications',
+    'projects': 'projects',
+    'extras': 'extracurricular/achievements',
+    'languages': 'languages',
+    'awards': 'awards',
+}
+
+
+def edit(value, tag):
+    """Append `tag` to every non-empty string leaf so the section hashes (and wraps) differently."""
+    if isinstance(value, dict):
+        # social names select header icons, so leave them alone
+        return {k: v if k == 'socials' else edit(v, tag) for k, v in value.items()}
+    if isinstance(value, list):
+        return [edit(v, tag) for v in value]
+    if isinstance(value, str) and value and '@' not in value and '://' not in value:
+        return f"{value} {tag}"
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--input", default="data/sample.json")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    present = [key for key in DEFAULT_SECTION_ORDER if base.get(SECTION_FIELDS[key])]
+
+    JsonToPDFBuilder().build(base)  # warm fonts, styles and the unchanged sections
+    results = []
+    counter = 0
+    for unchanged in range(len(present) + 1):
+        samples = []
+        for _ in range(args.iterations):
+            counter += 1
+            data = copy.deepcopy(base)
+            for key in present[unchanged:]:
+                field = SECTION_FIELDS[key]
+                data[field] = edit(data[field], f"v{counter}")
+            start = time.perf_counter()
+            JsonToPDFBuilder().build(data)
+            samples.append((time.perf_counter() - start) * 1000)
+        results.append({
+            "unchanged_sections": unchanged,
+            "edited_sections": len(present) - unchanged,
+            "mean_ms": round(statistics.mean(samples), 2),
+            "median_ms": round(statistics.median(samples), 2),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
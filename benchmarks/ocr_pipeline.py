@@ -0,0 +1,153 @@
+"""
+OCR of scanned (image-only) PDF pages (utils.OCRPipeline).
+
+Run from the repository root:
+    python -m benchmarks.ocr_pipeline [--pages 2 8 16] [--workers 2] [--iterations 3]
+                                      [--engine stub|tesseract] [--budget 1.0]
+                                      [--output results.json]
+
+Synthetic uploads where every other page is a scan (a picture of text, no text
+layer) and every fourth page is A3 are OCRed three ways:
+  - `legacy`: the former loop, every image-only page rasterized in RGB at 300 dpi
+    and OCRed one after the other;
+  - `serial`: OCRPipeline in-process (DPI picked from page size, grayscale);
+  - `pool`: OCRPipeline on a process pool of --workers (started beforehand).
+It reports p50 / p95 latency, the megapixels handed to the engine and the pages
+OCRed per way. A last run with a --budget seconds time budget on the largest
+document shows that wall time stays bounded and how many pages were dropped.
+The default `stub` engine decodes the PNG and scans its pixels (cost grows with
+the pixel count, like a real engine) so the benchmark runs without tesseract.
+"""
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import fitz
+
+from benchmarks.render_suite import percentile
+from core.config import settings
+from utils.OCREngine import OCREngine, TesseractOCREngine
+from utils.OCRPipeline import OCRPipeline, page_dpi
+
+
+class StubOCREngine(OCREngine):
+    """Decodes the image and scans every pixel; returns its size instead of text."""
+
+    def image_to_text(self, png: bytes, timeout: Optional[float] = None) -> str:
+        from PIL import Image, ImageOps
+
+        with Image.open(io.BytesIO(png)) as image:
+            gray = ImageOps.autocontrast(image.convert('L'))
+            dark = sum(gray.histogram()[:128])
+            return f'{image.width}x{image.height} {dark}'
+
+
+def make_scanned_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_num in range(pages):
+        width, height = fitz.paper_size('a3' if page_num % 4 == 3 else 'letter')
+        page = doc.new_page(width=width, height=height)
+        text = '\n'.join(f'Line {line} of page {page_num}: shipped features to many customers'
+                         for line in range(40))
+        if page_num % 2 == 0:
+            page.insert_textbox(fitz.Rect(40, 40, width - 40, height - 40), text, fontsize=10)
+            continue
+        # A scan: the same kind of page, rendered to a picture
+        with fitz.open() as source:
+            scanned = source.new_page(width=width, height=height)
+            scanned.insert_textbox(fitz.Rect(40, 40, width - 40, height - 40), text, fontsize=10)
+            image = scanned.get_pixmap(dpi=150).tobytes('png')
+        page.insert_image(page.rect, stream=image)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def image_only_pages(file_bytes: bytes):
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return [page.number + 1 for page in doc if not page.get_text().strip()]
+
+
+def legacy_ocr(file_bytes: bytes, engine: OCREngine):
+    texts, pixels = {}, 0
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        for page_num, page in enumerate(doc, start=1):
+            if not page.get_text().strip():
+                pix = page.get_pixmap(dpi=300)
+                pixels += pix.width * pix.height
+                texts[page_num] = engine.image_to_text(pix.tobytes("png"))
+    return texts, pixels
+
+
+def pipeline_ocr(pipeline: OCRPipeline, file_bytes: bytes, executor=None):
+    pages = image_only_pages(file_bytes)
+    pixels = 0
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        for page_num in pages:
+            rect = doc[page_num - 1].rect
+            dpi = page_dpi(rect.width, rect.height, pipeline.target_pixels, pipeline.min_dpi, pipeline.max_dpi)
+            pixels += round(rect.width * dpi / 72) * round(rect.height * dpi / 72)
+    return dict(pipeline.iter_pages(file_bytes, pages, executor)), pixels
+
+
+def measure(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        texts, pixels = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2),
+            "megapixels": round(pixels / 1e6, 1), "pages_ocred": len(texts)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 8, 16])
+    parser.add_argument("--workers", type=int, default=settings.EXTRACT_WORKERS)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--engine", choices=["stub", "tesseract"], default="stub")
+    parser.add_argument("--budget", type=float, default=1.0, help="time budget (s) of the last run")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    engine = StubOCREngine() if args.engine == "stub" else TesseractOCREngine(lang=settings.OCR_LANG)
+    pipeline = OCRPipeline(engine, time_budget=3600, target_pixels=settings.OCR_TARGET_PIXELS,
+                           min_dpi=settings.OCR_MIN_DPI, max_dpi=settings.OCR_MAX_DPI)
+    results = {"cpus": os.cpu_count(), "workers": args.workers, "engine": args.engine}
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(abs, range(args.workers)))  # start the workers outside the measurements
+        for pages in args.pages:
+            file_bytes = make_scanned_pdf(pages)
+            ways = {
+                'legacy': lambda: legacy_ocr(file_bytes, engine),
+                'serial': lambda: pipeline_ocr(pipeline, file_bytes),
+                'pool': lambda: pipeline_ocr(pipeline, file_bytes, executor),
+            }
+            report = {name: measure(fn, args.iterations) for name, fn in ways.items()}
+            report["speedup"] = round(report['legacy']['p50_ms'] / report['pool']['p50_ms'], 2)
+            results[pages] = report
+
+        file_bytes = make_scanned_pdf(max(args.pages))
+        budgeted = OCRPipeline(engine, time_budget=args.budget, target_pixels=settings.OCR_TARGET_PIXELS,
+                               min_dpi=settings.OCR_MIN_DPI, max_dpi=settings.OCR_MAX_DPI)
+        start = time.perf_counter()
+        texts, _ = pipeline_ocr(budgeted, file_bytes, executor)
+        results["budget"] = {
+            "budget_s": args.budget,
+            "wall_s": round(time.perf_counter() - start, 2),
+            "pages_ocred": len(texts),
+            "pages_dropped": len(image_only_pages(file_bytes)) - len(texts),
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
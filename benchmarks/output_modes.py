@@ -0,0 +1,76 @@
+"""
+Size / latency trade-off of the PDF output modes (services.PDFOptimizer).
+
+Run from the repository root:
+    python -m benchmarks.output_modes [--iterations 20] [--output results.json]
+
+For every synthetic profile it renders the resume in each output mode and reports
+the PDF size, render latency (p50 / p95, render + optimization, section cache warm)
+and the share of the standard size saved. It also checks that every page
+rasterizes to the same pixels in both modes (`identical`).
+"""
+import argparse
+import json
+import time
+
+import fitz
+
+from benchmarks.render_suite import percentile
+from benchmarks.synthetic_resume import PROFILES, load_seed, generate_profile
+from services.JsonToPDFBuilder import JsonToPDFBuilder
+from services.PDFOptimizer import OUTPUT_MODES, finish_pdf
+
+
+def render(builder, resume_data, output):
+    return finish_pdf(builder.build(resume_data), output)
+
+
+def pages_identical(pdf_a: bytes, pdf_b: bytes, dpi: int = 72) -> bool:
+    with fitz.open(stream=pdf_a, filetype="pdf") as a, fitz.open(stream=pdf_b, filetype="pdf") as b:
+        if a.page_count != b.page_count:
+            return False
+        return all(
+            pa.get_pixmap(dpi=dpi).samples == pb.get_pixmap(dpi=dpi).samples
+            for pa, pb in zip(a, b)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--input", default="data/sample.json", help="seed resume")
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    seed = load_seed(args.input)
+    builder = JsonToPDFBuilder()
+    results = {}
+    for profile in PROFILES:
+        resume_data = generate_profile(seed, profile)
+        pdfs = {mode: render(builder, resume_data, mode) for mode in OUTPUT_MODES}  # also warms the caches
+        report = {}
+        for mode in OUTPUT_MODES:
+            samples = []
+            for _ in range(args.iterations):
+                start = time.perf_counter()
+                render(builder, resume_data, mode)
+                samples.append((time.perf_counter() - start) * 1000)
+            report[mode] = {
+                "bytes": len(pdfs[mode]),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+            }
+        standard = report['standard']['bytes']
+        for mode in OUTPUT_MODES:
+            report[mode]["saved_pct"] = round(100 * (1 - report[mode]["bytes"] / standard), 1)
+        report["identical"] = pages_identical(pdfs['standard'], pdfs['web'])
+        results[profile] = report
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Upload text extraction over PDFs of 1 to 50 pages (utils.PDFTextExtractor).
+
+Run from the repository root:
+    python -m benchmarks.pdf_extraction [--pages 1 2 5 10 20 50] [--workers 2]
+                                        [--iterations 10] [--output results.json]
+
+Synthetic documents of each page count (a running header, dense text and a few
+links per page, like a portfolio or academic CV) are extracted three ways:
+  - `legacy`: the former serial get_text() loop growing one string with +=;
+  - `in_process`: PDFTextExtractor's small-document path (serial, one join);
+  - `pool`: pages split across --workers processes (pool started beforehand).
+It reports p50 / p95 latency per way, the speedup of the default extractor
+(pool from EXTRACT_PARALLEL_MIN_PAGES pages on) over `legacy`, checks that both
+extractor paths return the same text (`identical`) and compares the size of the
+legacy text with the compact text now sent to the LLM (`legacy_chars`,
+`compact_chars`, `saved_pct`).
+"""
+import argparse
+import json
+import os
+import time
+
+import fitz
+
+from benchmarks.render_suite import percentile
+from core.config import settings
+from utils.PDFTextExtractor import PDFTextExtractor
+
+WORDS = ("designed built led migrated reduced latency throughput pipeline service platform "
+         "customers revenue analytics distributed systems python kubernetes research published").split()
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        page.insert_text((40, 30), 'Jane Doe  -  Curriculum Vitae', fontsize=8)
+        lines = [' '.join(WORDS[(page_num + line + i) % len(WORDS)] for i in range(13)) + f' {page_num}.{line}'
+                 for line in range(55)]
+        page.insert_textbox(fitz.Rect(40, 40, 570, 760), '\n'.join(lines), fontsize=9)
+        for i in range(3):
+            page.insert_link({'kind': fitz.LINK_URI, 'from': fitz.Rect(40, 40 + 12 * i, 200, 50 + 12 * i),
+                              'uri': f'https://example.com/{page_num}/{i}'})
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def legacy_extract(file_bytes: bytes) -> str:
+    doc = fitz.open(stream=file_bytes, filetype="pdf")
+    full_text = ""
+    for page_num, page in enumerate(doc, start=1):
+        text = page.get_text().strip()
+        full_text += f"\n\n--- Page {page_num} (Text) ---\n{text}"
+        for link in page.get_links():
+            if 'uri' in link:
+                full_text += f"[Link found on Page {page_num}]: {link['uri']}\n"
+    doc.close()
+    return full_text
+
+
+def measure(fn, file_bytes: bytes, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(file_bytes)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10, 20, 50])
+    parser.add_argument("--workers", type=int, default=settings.EXTRACT_WORKERS)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    in_process = PDFTextExtractor(max_workers=1)
+    pool = PDFTextExtractor(max_workers=args.workers, min_parallel_pages=2)
+    pool.extract(make_pdf(2))  # start the workers outside the measurements
+    ways = {'legacy': legacy_extract, 'in_process': in_process.extract, 'pool': pool.extract}
+    results = {"cpus": os.cpu_count(), "workers": args.workers}
+    try:
+        for pages in args.pages:
+            file_bytes = make_pdf(pages)
+            texts = {name: fn(file_bytes) for name, fn in ways.items()}
+            report = {name: measure(fn, file_bytes, args.iterations) for name, fn in ways.items()}
+            default = 'pool' if pages >= settings.EXTRACT_PARALLEL_MIN_PAGES else 'in_process'
+            report["default"] = default
+            report["speedup"] = round(report['legacy']['p50_ms'] / report[default]['p50_ms'], 2)
+            report["identical"] = texts['in_process'] == texts['pool']
+            report["legacy_chars"] = len(texts['legacy'])
+            report["compact_chars"] = len(texts['pool'])
+            report["saved_pct"] = round(100 * (1 - len(texts['pool']) / len(texts['legacy'])), 1)
+            results[pages] = report
+    finally:
+        pool.shutdown()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
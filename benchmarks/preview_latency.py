@@ -0,0 +1,59 @@
+"""
+HTML preview vs. PDF render latency.
+
+Run from the repository root:
+    python -m benchmarks.preview_latency [--iterations 30]
+
+Every render gets new content (as while typing in the editor), so the PDF side
+does not benefit from the section cache. Reports p50 / p95 of both paths and
+the speedup of the preview per synthetic profile.
+"""
+import argparse
+import json
+import time
+
+from benchmarks.render_suite import percentile
+from benchmarks.synthetic_resume import PROFILES, load_seed, generate_profile
+from services.JsonToPDFBuilder import JsonToPDFBuilder
+from services.ResumeHTMLBuilder import ResumeHTMLBuilder
+
+
+def measure(render, seed, profile, iterations, tag):
+    samples = []
+    for i in range(iterations):
+        resume_data = generate_profile(seed, profile, salt=f" #{tag}{i}")
+        start = time.perf_counter()
+        render(resume_data)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--input", default="data/sample.json", help="seed resume")
+    args = parser.parse_args()
+
+    seed = load_seed(args.input)
+    pdf_builder = JsonToPDFBuilder()
+    html_builder = ResumeHTMLBuilder()
+    warmup = generate_profile(seed, 'small', salt=" #warmup")
+    pdf_builder.build(warmup)
+    html_builder.build_page(warmup)
+
+    results = {}
+    for profile in PROFILES:
+        pdf = measure(pdf_builder.build, seed, profile, args.iterations, 'pdf')
+        html = measure(html_builder.build_page, seed, profile, args.iterations, 'html')
+        results[profile] = {
+            "pdf_p50_ms": round(percentile(pdf, 50), 3),
+            "pdf_p95_ms": round(percentile(pdf, 95), 3),
+            "html_p50_ms": round(percentile(html, 50), 3),
+            "html_p95_ms": round(percentile(html, 95), 3),
+            "speedup_p50": round(percentile(pdf, 50) / percentile(html, 50), 1),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-request PDF render latency on data/sample.json.
+
+Run from the repository root:
+    python -m benchmarks.render_latency [--iterations 50]
+
+`cold` re-registers fonts and recompiles styles before every render (the old
+per-request behaviour); `warm` uses the process-wide PDFStyleRegistry.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from services.JsonToPDFBuilder import JsonToPDFBuilder
+from services.PDFStyleRegistry import PDFStyleRegistry
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(resume_data, iterations, cold):
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            PDFStyleRegistry.reset()
+        start = time.perf_counter()
+        JsonToPDFBuilder().build(resume_data)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.mean(samples), 2),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--input", default="data/sample.json")
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        resume_data = json.load(f)
+
+    JsonToPDFBuilder().build(resume_data)  # import / first-use warmup
+    results = {
+        "cold": measure(resume_data, args.iterations, cold=True),
+        "warm": measure(resume_data, args.iterations, cold=False),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+PDF rendering benchmark suite over synthetic resumes of increasing size.
+
+Run from the repository root (offline, no AWS / OpenAI access needed):
+    python -m benchmarks.render_suite [--iterations 30] [--profiles small large]
+                                      [--output results.json]
+
+For every profile in benchmarks.synthetic_resume.PROFILES it reports:
+  - latency percentiles of JsonToPDFBuilder.build, both `fresh` (new content
+    every render, so the section cache misses) and `cached` (same content);
+  - peak Python heap of one render (tracemalloc), output size and page count;
+  - output bytes contributed by each section type (header + section vs. header only).
+The whole report is printed as JSON (and written to --output) so runs from
+different releases can be diffed.
+"""
+import argparse
+import json
+import platform
+import resource
+import statistics
+import time
+import tracemalloc
+
+import fitz
+import reportlab
+
+from benchmarks.synthetic_resume import PROFILES, load_seed, generate_profile
+from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples):
+    return {
+        "mean_ms": round(statistics.mean(samples), 2),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p90_ms": round(percentile(samples, 90), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "max_ms": round(max(samples), 2),
+    }
+
+
+def timed_render(builder, resume_data, order=None):
+    start = time.perf_counter()
+    builder.build(resume_data, order)
+    return (time.perf_counter() - start) * 1000
+
+
+def page_count(pdf_bytes: bytes) -> int:
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def peak_memory_kib(builder, resume_data) -> float:
+    tracemalloc.start()
+    try:
+        builder.build(resume_data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def section_sizes(builder, resume_data) -> dict:
+    """Bytes each section adds on top of a header-only document."""
+    header_only = len(builder.build(resume_data, ['personal_info']))
+    sizes = {}
+    for key in DEFAULT_SECTION_ORDER:
+        if key == 'personal_info':
+            continue
+        sizes[key] = len(builder.build(resume_data, ['personal_info', key])) - header_only
+    sizes['personal_info'] = header_only
+    return sizes
+
+
+def bench_profile(builder, seed, profile, iterations):
+    resume_data = generate_profile(seed, profile)
+    pdf_bytes = builder.build(resume_data)  # also warms the section cache for `cached`
+    fresh = [timed_render(builder, generate_profile(seed, profile, salt=f" #{i}")) for i in range(iterations)]
+    cached = [timed_render(builder, resume_data) for _ in range(iterations)]
+    return {
+        "params": PROFILES[profile],
+        "pages": page_count(pdf_bytes),
+        "size_bytes": len(pdf_bytes),
+        "latency_fresh": summarize(fresh),
+        "latency_cached": summarize(cached),
+        "peak_memory_kib": peak_memory_kib(builder, generate_profile(seed, profile, salt=" #mem")),
+        "section_size_bytes": section_sizes(builder, resume_data),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--input", default="data/sample.json", help="seed resume")
+    parser.add_argument("--profiles", nargs="+", choices=sorted(PROFILES), default=list(PROFILES))
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    seed = load_seed(args.input)
+    builder = JsonToPDFBuilder()
+    builder.build(generate_profile(seed, 'small', salt=" #warmup"))  # fonts, styles, icons
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "reportlab": reportlab.Version,
+            "platform": platform.platform(),
+            "template_version": JsonToPDFBuilder.TEMPLATE_VERSION,
+        },
+        "iterations": args.iterations,
+        "profiles": {profile: bench_profile(builder, seed, profile, args.iterations) for profile in args.profiles},
+        # ru_maxrss is KiB on Linux
+        "max_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Synthetic resume generator for the benchmarks.
+
+Entries are cycled from a seed resume (data/sample.json by default) and made
+unique with a per-copy suffix, so wrapping and caching behave like real,
+distinct content. Output is validated against database.model.ResumeSchema and
+dumped by alias, i.e. in the shape JsonToPDFBuilder reads.
+"""
+import copy
+import json
+import random
+from typing import Optional
+
+from database.model import ResumeSchema
+
+# Named sizes used by the benchmark suite; pages are whatever these lay out to
+PROFILES = {
+    'small': {'experiences': 1, 'bullets': 3, 'projects': 1},
+    'medium': {'experiences': 3, 'bullets': 4, 'projects': 2},
+    'large': {'experiences': 6, 'bullets': 6, 'projects': 4},
+    'xlarge': {'experiences': 12, 'bullets': 8, 'projects': 8},
+}
+
+# Stand-ins for required fields the seed leaves empty (null)
+_FILLERS = {
+    'issuing_organization': 'Issuing Organization',
+    'description': 'Recognized for outstanding contribution.',
+    'type': 'Achievement',
+    'location': 'Remote',
+    'date': 'Jan 2024',
+}
+
+
+def load_seed(path: str = 'data/sample.json') -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _fill(entry: dict) -> dict:
+    return {k: (_FILLERS.get(k) if v is None and k in _FILLERS else v) for k, v in entry.items()}
+
+
+def _bullets(pool, count, rng, tag):
+    return [f"{rng.choice(pool)} ({tag}.{i})" for i in range(count)]
+
+
+def _cycle(items, count, make):
+    return [make(copy.deepcopy(items[i % len(items)]), i) for i in range(count)] if items else []
+
+
+def generate_resume(seed: dict, experiences: int = 3, bullets: int = 4, projects: int = 2,
+                    rng_seed: Optional[int] = 0, salt: str = '') -> dict:
+    """
+    Build a resume with the given number of experiences / projects, each with
+    `bullets` bullet points. `salt` is appended to generated text so repeated
+    calls can defeat (or, with the same salt, hit) the render caches.
+    """
+    rng = random.Random(rng_seed)
+    bullet_pool = [p for exp in seed.get('experiences') or [] for p in exp.get('points') or []]
+    bullet_pool += [p for proj in seed.get('projects') or [] for p in proj.get('projectDetails') or []]
+    bullet_pool = bullet_pool or ['Delivered features end to end.']
+
+    def make_experience(exp, i):
+        exp['designation'] = f"{exp['designation']} {i + 1}{salt}"
+        exp['points'] = _bullets(bullet_pool, bullets, rng, f"e{i}{salt}")
+        return _fill(exp)
+
+    def make_project(proj, i):
+        proj['projectName'] = f"{proj['projectName']} {i + 1}{salt}"
+        proj['projectDetails'] = _bullets(bullet_pool, bullets, rng, f"p{i}{salt}")
+        return _fill(proj)
+
+    data = copy.deepcopy(seed)
+    data['summary'] = f"{seed.get('summary') or ''}{salt}"
+    data['experiences'] = _cycle(seed.get('experiences') or [], experiences, make_experience)
+    data['projects'] = _cycle(seed.get('projects') or [], projects, make_project)
+    for key in ('certifications', 'awards', 'extracurricular/achievements'):
+        data[key] = [_fill(entry) for entry in data.get(key) or []]
+    return ResumeSchema.model_validate(data).model_dump(by_alias=True)
+
+
+def generate_profile(seed: dict, profile: str, rng_seed: Optional[int] = 0, salt: str = '') -> dict:
+    return generate_resume(seed, rng_seed=rng_seed, salt=salt, **PROFILES[profile])
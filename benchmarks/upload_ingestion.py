@@ -0,0 +1,157 @@
+"""
+Resume upload ingestion (utils.UploadIngestor) against reading the whole upload.
+
+Run from the repository root:
+    python -m benchmarks.upload_ingestion [--sizes-mb 0.5 2 8] [--iterations 5]
+                                          [--output results.json]
+
+For PDFs padded to each size (a 2 page resume plus an embedded attachment, like
+a portfolio with a scan) it times reading the upload, hashing it and extracting
+its text two ways, and reports the tracemalloc peak of each:
+  - `legacy`: `await resume_file.read()` into one bytes object, hashed and handed
+    to the extractor;
+  - `ingest`: UploadIngestor's chunked read, SHA-256 on the way in, spooled to a
+    temp file past UPLOAD_SPOOL_MEMORY_BYTES and opened by PyMuPDF through an mmap.
+It also times how long a legacy .doc of the largest size takes to be refused:
+read in full and failing in the DOCX parser before, refused after its first chunk now.
+Finally it checks that UploadSizeLimit answers an oversized upload with 413 both
+with a Content-Length and sent chunked (no length up front), through a FastAPI
+route parsing the form like the upload endpoint; the run fails otherwise.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fitz
+from fastapi import FastAPI, File, UploadFile as FastAPIUploadFile
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from benchmarks.pdf_extraction import make_pdf
+from benchmarks.render_suite import percentile
+from core.config import settings
+from services.UploadParseCache import UploadParseCache
+from utils.FileOperations import FileOperations
+from utils.UploadIngestor import OLE_MAGIC, UploadIngestor, UploadRejected, UploadSizeLimit
+
+
+def make_padded_pdf(size_mb: float) -> bytes:
+    with fitz.open(stream=make_pdf(2), filetype="pdf") as doc:
+        padding = max(0, int(size_mb * 1024 * 1024) - len(doc.tobytes()))
+        doc.embfile_add('scan.bin', os.urandom(padding))  # random: does not compress away
+        return doc.tobytes()
+
+
+def upload_file(data: bytes, filename: str) -> UploadFile:
+    """An UploadFile as Starlette's multipart parser hands it over: spooled to disk past 1 MB."""
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(data)
+    spool.seek(0)
+    return UploadFile(spool, filename=filename)
+
+
+async def legacy(resume_file: UploadFile):
+    filename = resume_file.filename
+    contents = await resume_file.read()
+    UploadParseCache.file_digest(contents)
+    file_operations = FileOperations()
+    try:
+        # The former routing by extension, .doc included
+        if filename.endswith('.pdf'):
+            return file_operations.extract_text_from_pdf_bytes(contents)
+        return file_operations.extract_text_from_doc_bytes(contents)
+    except Exception:
+        return None
+
+
+async def ingest(ingestor: UploadIngestor, resume_file: UploadFile):
+    try:
+        upload = await ingestor.ingest(resume_file)
+    except UploadRejected:
+        return None
+    with upload:
+        return FileOperations().extract_text_from_file_bytes(upload.data(), upload.filename, upload.file_type)
+
+
+def measure(run, data: bytes, filename: str, iterations: int):
+    """Latency and heap peak of run(upload); each upload is spooled beforehand, outside both."""
+    samples = []
+    for _ in range(iterations):
+        resume_file = upload_file(data, filename)
+        start = time.perf_counter()
+        asyncio.run(run(resume_file))
+        samples.append((time.perf_counter() - start) * 1000)
+    resume_file = upload_file(data, filename)
+    tracemalloc.start()
+    asyncio.run(run(resume_file))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"p50_ms": round(percentile(samples, 50), 2), "p95_ms": round(percentile(samples, 95), 2),
+            "peak_kb": round(peak / 1024)}
+
+
+def size_limit_statuses(max_body_bytes: int = 1024 * 1024) -> dict:
+    """Status of an upload over `max_body_bytes`, sent with a Content-Length and chunked."""
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(resume_file: FastAPIUploadFile = File(...)):
+        return {"size": len(await resume_file.read())}
+
+    app.add_middleware(UploadSizeLimit, max_body_bytes=max_body_bytes, path_suffixes=("/upload",))
+    files = {"resume_file": ("resume.pdf", b"%PDF-1.4\n" + os.urandom(2 * max_body_bytes), "application/pdf")}
+    with TestClient(app) as client:
+        request = client.build_request("POST", "/upload", files=files)
+        body = request.read()
+
+        def chunks():
+            for start in range(0, len(body), 64 * 1024):
+                yield body[start:start + 64 * 1024]
+
+        sized = client.post("/upload", files=files)
+        chunked = client.post("/upload", content=chunks(),
+                              headers={"content-type": request.headers["content-type"]})
+    return {"content_length": sized.status_code, "chunked": chunked.status_code}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.5, 2, 8])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    ingestor = UploadIngestor.from_settings(settings)
+    results = {"spool_memory_bytes": ingestor.spool_memory_bytes}
+    for size_mb in args.sizes_mb:
+        data = make_padded_pdf(size_mb)
+        report = {
+            'legacy': measure(legacy, data, 'resume.pdf', args.iterations),
+            'ingest': measure(lambda f: ingest(ingestor, f), data, 'resume.pdf', args.iterations),
+        }
+        report["peak_saved_pct"] = round(100 * (1 - report['ingest']['peak_kb'] / report['legacy']['peak_kb']), 1)
+        results[size_mb] = report
+
+    doc_file = OLE_MAGIC + os.urandom(int(max(args.sizes_mb) * 1024 * 1024))
+    results["legacy_doc_rejected"] = {
+        'legacy': measure(legacy, doc_file, 'resume.doc', args.iterations),
+        'ingest': measure(lambda f: ingest(ingestor, f), doc_file, 'resume.doc', args.iterations),
+    }
+
+    results["oversized_upload_status"] = statuses = size_limit_statuses()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if set(statuses.values()) != {413}:
+        sys.exit(f"Oversized uploads must be refused with 413, got {statuses}")
+
+
+if __name__ == '__main__':
+    main()
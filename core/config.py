@@ -22,6 +22,48 @@ class Settings(BaseSettings):
     openai_key: Optional[str] = None
     gemini_url: Optional[str] = None
     deepseek_url: Optional[str] = None
+
+    # PDF rendering
+    PDF_WARMUP_ON_STARTUP: Optional[bool] = None  # Register fonts and compile styles before the first request (None: on, except on AWS Lambda)
+    PDF_RENDER_EXECUTOR: str = "process"  # "process" or "thread" (Lambda falls back to threads)
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_QUEUE_SIZE: int = 8  # Jobs allowed to wait for a worker before returning 503
+    PDF_RENDER_TIMEOUT_SECONDS: float = 30.0
+    PDF_DEFAULT_OUTPUT: str = "standard"  # "standard", or "web": re-subset fonts, drop hinting, object streams (~40% smaller)
+    PDF_RENDER_METRICS: bool = False  # Time every section renderer and doc.build, logged as one JSON line per render
+    PDF_SERVER_TIMING: bool = False  # Expose those timings as a Server-Timing header on PDF downloads
+    PDF_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # In-memory LRU budget for rendered PDFs
+    PDF_CACHE_DISK_DIR: Optional[str] = None  # e.g. "files/pdf_cache" to keep rendered PDFs across restarts
+    PDF_CACHE_MAX_DISK_BYTES: int = 512 * 1024 * 1024
+    PDF_ARTIFACT_STORE: Optional[str] = None  # Pre-render PDFs when a resume is saved: None (off), "local" or "s3"; long-lived servers only, ignored on AWS Lambda
+    PDF_ARTIFACT_DIR: str = "files/pdf_artifacts"  # "local" store root
+    PDF_ARTIFACT_BUCKET: Optional[str] = None  # "s3" store bucket
+    PDF_ARTIFACT_PREFIX: str = "resume-pdfs/"
+    THUMBNAIL_CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # In-memory LRU budget for first-page PNGs
+    THUMBNAIL_CACHE_DISK_DIR: Optional[str] = None
+    THUMBNAIL_CACHE_MAX_DISK_BYTES: int = 128 * 1024 * 1024
+    THUMBNAIL_PREFETCH_LIMIT: Optional[int] = None  # Most thumbnails a list request may have pre-rendered (None: 20, except on AWS Lambda: 0)
+
+    # Resume upload parsing
+    EXTRACT_EXECUTOR: str = "process"  # "process" or "thread" (Lambda falls back to threads)
+    EXTRACT_WORKERS: int = 2  # Workers splitting the pages of long PDFs
+    EXTRACT_PARALLEL_MIN_PAGES: int = 8  # Shorter PDFs are read in-process, where the pool's overhead would dominate
+    OCR_ENGINE: Optional[str] = "tesseract"  # For image-only PDF pages (needs the tesseract binary); None: skip them
+    OCR_LANG: str = "eng"
+    OCR_TIME_BUDGET_SECONDS: float = 20  # Per document; pages not OCRed by then are left out
+    OCR_TARGET_PIXELS: int = 3300  # Long side of a rasterized page (US Letter at 300 dpi); DPI follows page size
+    OCR_MIN_DPI: int = 150
+    OCR_MAX_DPI: int = 400
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024  # Larger resume files are refused with 413 as they stream in
+    UPLOAD_CHUNK_BYTES: int = 64 * 1024
+    UPLOAD_SPOOL_MEMORY_BYTES: int = 1024 * 1024  # Uploads past this are spooled to a temp file (mmapped for PyMuPDF)
+    UPLOAD_MAX_DOCX_XML_BYTES: int = 64 * 1024 * 1024  # Uncompressed word/document.xml; refuses zip bombs
+    UPLOAD_CACHE_MAX_BYTES: int = 8 * 1024 * 1024  # In-memory LRU of extracted text / parsed JSON per uploaded file
+    UPLOAD_CACHE_DISK_DIR: Optional[str] = None  # e.g. "files/upload_cache" (holds resume contents)
+    UPLOAD_CACHE_MAX_DISK_BYTES: int = 64 * 1024 * 1024
+
+    # Lambda cold start
+    COLD_IMPORT_BUDGET_MS: float = 1500  # Budget for `import app`, checked by benchmarks/cold_import.py
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
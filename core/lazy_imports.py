@@ -0,0 +1,35 @@
+import importlib
+import sys
+import types
+from typing import Dict
+
+
+class _LazyPackage(types.ModuleType):
+    _lazy: Dict[str, str] = {}
+
+    def __setattr__(self, name, value):
+        # Importing `package.Name` binds the submodule on the package; keep the class it is named after
+        if name in self._lazy and isinstance(value, types.ModuleType):
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+def lazy_package(package: str, names: Dict[str, str]):
+    """
+    Make `package.<Name>` import `names[Name]` on first access (PEP 562) instead of at
+    package import, so e.g. a Lambda cold start does not load ReportLab or openai.
+    `names` maps the exported class to the submodule that defines it.
+    """
+    module = sys.modules[package]
+
+    def __getattr__(name):
+        submodule = names.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule), name)
+        setattr(module, name, value)
+        return value
+
+    module.__getattr__ = __getattr__
+    module.__class__ = type('LazyPackage', (_LazyPackage,), {'_lazy': dict(names)})
+    module.__all__ = [*getattr(module, '__all__', []), *names]
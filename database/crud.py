@@ -1,8 +1,11 @@
+import asyncio
+import random
 import uuid
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from botocore.exceptions import ClientError
 
-from database.dynamodb_client import get_users_table, get_resumes_table, get_metadata_table
+from database.dynamodb_client import get_users_table, get_resumes_table, get_metadata_table, get_dynamodb
+from core.config import settings
 from database.model import (
     UserCreate, UserInDB, ResumeCreate, ResumeUpdate, ResumeInDB, now_iso
 )
@@ -234,6 +237,47 @@ async def get_all_resumes_for_user(user_id: str, x_requried_data: Optional[bool]
         return []
 
 
+BATCH_GET_MAX_ATTEMPTS = 6  # BatchGetItem calls per chunk of keys, retries of throttled keys included
+BATCH_GET_BACKOFF_SECONDS = 0.05  # doubled after every retry, with full jitter, capped at 1s
+
+
+async def get_resumes_by_ids(user_id: str, resume_ids: List[str]) -> Tuple[List[ResumeInDB], List[str]]:
+    """
+    Fetch several of a user's resumes with BatchGetItem (100 keys per call) instead of one GetItem each.
+    Returns (resumes, unprocessed ids): the ids DynamoDB still had not served after
+    BATCH_GET_MAX_ATTEMPTS (throttling) or that failed with an error. Ids in neither do not exist.
+    """
+    table_name = settings.DYNAMODB_RESUMES_TABLE_NAME
+    unique_ids = list(dict.fromkeys(resume_ids))
+    items = []
+    unprocessed = []
+    for start in range(0, len(unique_ids), 100):
+        chunk = unique_ids[start:start + 100]
+        request = {table_name: {'Keys': [{'user_id': user_id, 'resume_id': rid} for rid in chunk]}}
+        try:
+            for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                if attempt:  # back off before retrying throttled keys
+                    await asyncio.sleep(random.uniform(0, min(BATCH_GET_BACKOFF_SECONDS * 2 ** attempt, 1.0)))
+                response = get_dynamodb().batch_get_item(RequestItems=request)
+                items.extend(response.get('Responses', {}).get(table_name, []))
+                request = response.get('UnprocessedKeys') or None
+                if not request:
+                    break
+        except ClientError as e:
+            print(f"Error batch getting resumes for user {user_id}: {e}")
+            fetched = {item['resume_id'] for item in items}
+            unprocessed.extend(rid for rid in chunk if rid not in fetched)
+            continue
+        if request:
+            keys = request[table_name]['Keys']
+            print(f"Gave up on {len(keys)} throttled resume keys for user {user_id} "
+                  f"after {BATCH_GET_MAX_ATTEMPTS} attempts")
+            unprocessed.extend(key['resume_id'] for key in keys)
+    resumes = [ResumeInDB(**item) for item in items]
+    resumes.sort(key=lambda x: x.updated_at, reverse=True)
+    return resumes, unprocessed
+
+
 async def update_resume(
         user_id: str, resume_id: str, resume_update_data: ResumeUpdate
 ) -> Optional[ResumeInDB]:
@@ -2,6 +2,7 @@ import boto3
 from botocore.exceptions import ClientError
 from core.config import settings
 import time
+import threading
 
 # --- DynamoDB Client Initialization ---
 import os
@@ -19,20 +20,30 @@ def get_dynamodb_resource():
         print(f"Connecting to AWS DynamoDB in region {settings.AWS_REGION_NAME}")
         return boto3.resource('dynamodb', region_name=settings.AWS_REGION_NAME)
 
-dynamodb_resource = get_dynamodb_resource()
+# Created on first use rather than at import, so importing the app (a Lambda cold start,
+# scripts, benchmarks) does not build a boto3 session it may never need
+_dynamodb_resource = None
+_dynamodb_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # Backwards compatible `dynamodb_client.dynamodb_resource`
+    if name == 'dynamodb_resource':
+        return get_dynamodb()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Table Creation Logic ---
 def create_users_table_if_not_exists():
     table_name = settings.DYNAMODB_USERS_TABLE_NAME
     try:
-        existing_table = dynamodb_resource.Table(table_name)
+        existing_table = get_dynamodb().Table(table_name)
         existing_table.load() # Check if table exists
         print(f"Users table '{table_name}' already exists.")
         return existing_table
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             print(f"Users table '{table_name}' not found. Creating...")
-            table = dynamodb_resource.create_table(
+            table = get_dynamodb().create_table(
                 TableName=table_name,
                 KeySchema=[
                     {'AttributeName': 'user_id', 'KeyType': 'HASH'}  # Partition key
@@ -68,14 +79,14 @@ def create_users_table_if_not_exists():
 def create_resumes_table_if_not_exists():
     table_name = settings.DYNAMODB_RESUMES_TABLE_NAME
     try:
-        existing_table = dynamodb_resource.Table(table_name)
+        existing_table = get_dynamodb().Table(table_name)
         existing_table.load()
         print(f"Resumes table '{table_name}' already exists.")
         return existing_table
     except ClientError as e:
         if e.response['Error']['Code'] == 'ResourceNotFoundException':
             print(f"Resumes table '{table_name}' not found. Creating...")
-            table = dynamodb_resource.create_table(
+            table = get_dynamodb().create_table(
                 TableName=table_name,
                 KeySchema=[
                     {'AttributeName': 'user_id', 'KeyType': 'HASH'},  # Partition key
@@ -99,12 +110,20 @@ def create_resumes_table_if_not_exists():
 # resumes_table_dynamo = create_resumes_table_if_not_exists()
 
 # You can get table objects directly when needed in CRUD
+def get_dynamodb():
+    global _dynamodb_resource
+    if _dynamodb_resource is None:
+        with _dynamodb_lock:
+            if _dynamodb_resource is None:
+                _dynamodb_resource = get_dynamodb_resource()
+    return _dynamodb_resource
+
 def get_users_table():
-    return dynamodb_resource.Table(settings.DYNAMODB_USERS_TABLE_NAME)
+    return get_dynamodb().Table(settings.DYNAMODB_USERS_TABLE_NAME)
 
 def get_resumes_table():
-    return dynamodb_resource.Table(settings.DYNAMODB_RESUMES_TABLE_NAME)
+    return get_dynamodb().Table(settings.DYNAMODB_RESUMES_TABLE_NAME)
 
 def get_metadata_table():
-    return dynamodb_resource.Table(settings.DYNAMODB_METADATA_TABLE_NAME)
+    return get_dynamodb().Table(settings.DYNAMODB_METADATA_TABLE_NAME)
 
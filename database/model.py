@@ -179,6 +179,15 @@ class JobDetailsInput(BaseModel):
     update_existing_resume: Optional[bool] = False # Whether to update an existing resume with this job description
     title: str = Field(default="Untitled Resume", max_length=100)
 
+class GalleryVariant(BaseModel):
+    template: Optional[str] = None  # classic if omitted
+    order: Optional[List[str]] = None  # section order; the default order if omitted
+
+class GalleryRequest(BaseModel):
+    resume_data: ResumeSchema
+    # One preview per variant; one per available template if omitted
+    variants: Optional[List[GalleryVariant]] = Field(None, min_length=1, max_length=12)
+
 class UserAppMetadata(BaseModel): # Example for user-specific app settings
     user_id: str
     username: str
@@ -0,0 +1,83 @@
+import base64
+import io
+import os
+import threading
+from typing import Dict, Optional
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+ICON_DIR = 'data/images'
+# Icons are drawn at 10pt; 64px is still ~460 dpi, versus 512px source PNGs
+ICON_PIXELS = 64
+# Drawn for socials we have no dedicated icon for
+FALLBACK_ICON = 'portfolio'
+
+
+class IconRegistry:
+    """
+    Process-wide cache of the header icons. Every PNG in ICON_DIR is decoded,
+    downscaled and split into RGB + alpha once; paragraphs then share these
+    readers, so a render never opens, decodes or re-samples an icon file.
+    """
+    _lock = threading.Lock()
+    _paths: Dict[str, str] = None  # icon name -> src path used in paragraph markup
+    _readers: Dict[str, ImageReader] = None  # src path -> decoded reader
+    _data_uris: Dict[str, str] = None  # src path -> downscaled PNG as a data: URI (HTML preview)
+
+    @staticmethod
+    def _decode(path: str):
+        with Image.open(path) as im:
+            im = im.convert('RGBA').resize((ICON_PIXELS, ICON_PIXELS), Image.LANCZOS)
+        png = io.BytesIO()
+        im.save(png, format='PNG')
+        data_uri = 'data:image/png;base64,' + base64.b64encode(png.getvalue()).decode('ascii')
+        reader = ImageReader(im)
+        # Decode eagerly: readers are shared by concurrent renders and must only be read
+        reader.getRGBData()
+        if reader._dataA is not None:
+            reader._dataA.getRGBData()
+        return reader, data_uri
+
+    @classmethod
+    def load(cls):
+        if cls._readers is not None:
+            return
+        with cls._lock:
+            if cls._readers is not None:
+                return
+            paths, readers, data_uris = {}, {}, {}
+            for filename in sorted(os.listdir(ICON_DIR)):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() != '.png':
+                    continue
+                path = f'{ICON_DIR}/{filename}'
+                paths[name.lower()] = path
+                readers[path], data_uris[path] = cls._decode(path)
+            cls._paths = paths
+            cls._data_uris = data_uris
+            cls._readers = readers
+
+    @classmethod
+    def warmup(cls):
+        """Eagerly decode every icon, e.g. at application startup."""
+        cls.load()
+
+    @classmethod
+    def icon_src(cls, name: str) -> str:
+        """Markup src for a social / contact name; unknown names get the fallback icon."""
+        cls.load()
+        key = name.strip().lower()
+        return cls._paths.get(key) or cls._paths[FALLBACK_ICON]
+
+    @classmethod
+    def reader_for(cls, src: str) -> Optional[ImageReader]:
+        """Shared decoded reader for an icon src, or None if it is not one of ours."""
+        cls.load()
+        return cls._readers.get(src)
+
+    @classmethod
+    def data_uri(cls, src: str) -> Optional[str]:
+        """The downscaled icon for `src` as an inline data: URI, for HTML output."""
+        cls.load()
+        return cls._data_uris.get(src)
@@ -0,0 +1,146 @@
+import os
+import tempfile
+from typing import Optional
+
+
+class PDFArtifactStore:
+    """
+    Durable store of pre-rendered resume PDFs, one current artifact per resume.
+    Artifacts are addressed by (user_id, resume_id, content_key), where content_key is
+    the RenderedPDFCache key of what was rendered, so a download only gets an artifact
+    back if the resume still hashes to the same content. Methods are blocking; call
+    them from a thread when on the event loop.
+    Artifacts are written by a pre-render that runs after the save response is sent,
+    which only holds on a long-lived server: under Mangum on AWS Lambda background
+    tasks run before the response is returned, so the store is not enabled there.
+    """
+
+    @staticmethod
+    def from_settings(settings) -> Optional['PDFArtifactStore']:
+        """The configured store, or None when pre-rendering is off (always on AWS Lambda)."""
+        backend = settings.PDF_ARTIFACT_STORE
+        if not backend:
+            return None
+        if "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+            # The pre-render and its upload would be added to every create / update / upload response
+            print(f"PDF_ARTIFACT_STORE={backend!r} ignored on AWS Lambda; resumes are not pre-rendered on save.")
+            return None
+        if backend == "local":
+            return LocalPDFArtifactStore(settings.PDF_ARTIFACT_DIR)
+        if backend == "s3":
+            return S3PDFArtifactStore(settings.PDF_ARTIFACT_BUCKET, settings.PDF_ARTIFACT_PREFIX,
+                                      region_name=settings.AWS_REGION_NAME)
+        raise ValueError(f"Unknown PDF artifact store: {backend!r}")
+
+    def get(self, user_id: str, resume_id: str, content_key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, user_id: str, resume_id: str, content_key: str, pdf_bytes: bytes):
+        """Store the artifact and drop the resume's older ones."""
+        raise NotImplementedError
+
+    def delete(self, user_id: str, resume_id: str):
+        raise NotImplementedError
+
+
+class LocalPDFArtifactStore(PDFArtifactStore):
+    """Artifacts as files under <root>/<user_id>/<resume_id>/<content_key>.pdf (dev / tests)."""
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _dir(self, user_id: str, resume_id: str) -> str:
+        return os.path.join(self.root_dir, user_id, resume_id)
+
+    def get(self, user_id: str, resume_id: str, content_key: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self._dir(user_id, resume_id), f'{content_key}.pdf'), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, user_id: str, resume_id: str, content_key: str, pdf_bytes: bytes):
+        directory = self._dir(user_id, resume_id)
+        os.makedirs(directory, exist_ok=True)
+        # Write-then-rename so a concurrent download never reads a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, os.path.join(directory, f'{content_key}.pdf'))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._remove(directory, keep=f'{content_key}.pdf')
+
+    def delete(self, user_id: str, resume_id: str):
+        directory = self._dir(user_id, resume_id)
+        self._remove(directory)
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remove(directory: str, keep: Optional[str] = None):
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            if name != keep and name.endswith('.pdf'):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+
+class S3PDFArtifactStore(PDFArtifactStore):
+    """Artifacts as S3 objects <prefix><user_id>/<resume_id>/<content_key>.pdf (prod)."""
+
+    def __init__(self, bucket: str, prefix: str = "", client=None, region_name: Optional[str] = None):
+        if not bucket:
+            raise ValueError("PDF_ARTIFACT_BUCKET must be set for the s3 artifact store")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.region_name = region_name
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            import boto3
+            self._client = boto3.client('s3', region_name=self.region_name)
+        return self._client
+
+    def _prefix(self, user_id: str, resume_id: str) -> str:
+        return f'{self.prefix}{user_id}/{resume_id}/'
+
+    def get(self, user_id: str, resume_id: str, content_key: str) -> Optional[bytes]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.get_object(Bucket=self.bucket,
+                                              Key=f'{self._prefix(user_id, resume_id)}{content_key}.pdf')
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                return None
+            raise
+        return response['Body'].read()
+
+    def put(self, user_id: str, resume_id: str, content_key: str, pdf_bytes: bytes):
+        key = f'{self._prefix(user_id, resume_id)}{content_key}.pdf'
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=pdf_bytes, ContentType='application/pdf')
+        self._remove(user_id, resume_id, keep=key)
+
+    def delete(self, user_id: str, resume_id: str):
+        self._remove(user_id, resume_id)
+
+    def _remove(self, user_id: str, resume_id: str, keep: Optional[str] = None):
+        listing = self.client.list_objects_v2(Bucket=self.bucket, Prefix=self._prefix(user_id, resume_id))
+        stale = [{'Key': obj['Key']} for obj in listing.get('Contents', []) if obj['Key'] != keep]
+        if stale:
+            self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': stale})
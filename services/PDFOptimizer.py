@@ -0,0 +1,51 @@
+import re
+
+OUTPUT_MODES = ('standard', 'web')
+DEFAULT_OUTPUT_MODE = 'standard'
+
+# ReportLab writes a flat page tree: one /Pages dictionary, uncompressed, holding the page count
+_PAGES_COUNT = re.compile(rb'/Count (\d+) /Kids \[[^\]]*\] /Type /Pages')
+
+
+def optimize_for_web(pdf_bytes: bytes) -> bytes:
+    """
+    Smaller PDF for download over the web, rendering identically:
+      - fonts are re-subset by MuPDF, which also drops TrueType hinting (fpgm / prep /
+        per-glyph instructions) that ReportLab's subsets keep and viewers don't need;
+      - ASCII85 is decoded and every stream re-deflated (binary instead of 7-bit safe);
+      - unused / duplicate objects are dropped and small objects packed into object streams.
+    MuPDF no longer writes linearized files; byte-range downloads (see utils/PDFResponse)
+    still let viewers fetch the first page early. Returns the input if nothing was gained.
+    """
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        doc.subset_fonts()
+        optimized = doc.tobytes(garbage=4, deflate=True, expand=255, use_objstms=1)
+    return optimized if len(optimized) < len(pdf_bytes) else pdf_bytes
+
+
+def pdf_page_count(pdf_bytes: bytes) -> int:
+    """
+    Pages in a rendered PDF. Read straight from ReportLab's page tree; a web-mode PDF keeps
+    it in a compressed object stream, so that one is opened with PyMuPDF instead.
+    """
+    match = _PAGES_COUNT.search(pdf_bytes)
+    if match:
+        return int(match.group(1))
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def warmup():
+    """Import PyMuPDF ahead of the first web-mode render (it is loaded lazily otherwise)."""
+    import fitz  # noqa: F401
+
+
+def finish_pdf(pdf_bytes: bytes, output: str = None) -> bytes:
+    """Apply the requested output mode to a rendered PDF."""
+    if output == 'web':
+        return optimize_for_web(pdf_bytes)
+    return pdf_bytes
@@ -0,0 +1,190 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, List, Tuple
+
+from services.PDFOptimizer import finish_pdf, warmup as warmup_optimizer
+from services.PDFThumbnailer import rasterize_first_page
+from services.RenderMetrics import RenderMetrics
+
+
+class RenderPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within the per-job timeout."""
+
+
+_builder = None
+
+
+def get_builder() -> 'JsonToPDFBuilder':
+    """The process-wide builder; JsonToPDFBuilder is reentrant, so every job and thread shares it."""
+    global _builder
+    if _builder is None:
+        # ReportLab is loaded by the first render, not when the app imports the pool
+        from services.JsonToPDFBuilder import JsonToPDFBuilder
+        _builder = JsonToPDFBuilder()
+    return _builder
+
+
+def _init_worker(default_output: Optional[str] = None):
+    from services.IconRegistry import IconRegistry
+    from services.PDFStyleRegistry import PDFStyleRegistry
+    from services.ResumeTemplate import ResumeTemplate
+
+    # Each worker process pays for fonts, styles and the builder once, not per job
+    PDFStyleRegistry.warmup()
+    IconRegistry.warmup()
+    ResumeTemplate.get()
+    get_builder()
+    if default_output == 'web':
+        warmup_optimizer()
+
+
+def render_pdf(json_data, order: Optional[List[str]] = None, fit_pages: Optional[int] = None,
+               template: Optional[str] = None, output: Optional[str] = None) -> bytes:
+    """Render one resume to PDF bytes. Module-level so process workers can unpickle it."""
+    pdf_bytes = get_builder().build(json_data, order, fit_pages=fit_pages, template=template)
+    return finish_pdf(pdf_bytes, output)
+
+
+def render_pdf_with_metrics(json_data, order: Optional[List[str]] = None, fit_pages: Optional[int] = None,
+                            template: Optional[str] = None,
+                            output: Optional[str] = None) -> Tuple[bytes, RenderMetrics]:
+    """render_pdf() with per-section / doc.build instrumentation; the metrics travel back with the PDF."""
+    metrics = RenderMetrics()
+    pdf_bytes = get_builder().build(json_data, order, fit_pages=fit_pages, template=template, metrics=metrics)
+    if output and output != 'standard':
+        with metrics.time('optimize'):
+            pdf_bytes = finish_pdf(pdf_bytes, output)
+        metrics.pdf_bytes = len(pdf_bytes)
+    return pdf_bytes, metrics
+
+
+def render_thumbnail(json_data, width: int, order: Optional[List[str]] = None,
+                     template: Optional[str] = None, output: Optional[str] = None) -> Tuple[bytes, bytes]:
+    """
+    Render a resume and rasterize its first page in one job; returns (pdf_bytes, png_bytes),
+    the PDF in the given output mode (the page is rasterized before that; it looks the same).
+    """
+    pdf_bytes = get_builder().build(json_data, order, template=template)
+    png_bytes = rasterize_first_page(pdf_bytes, width)
+    return finish_pdf(pdf_bytes, output), png_bytes
+
+
+class PDFRenderPool:
+    """
+    Runs PDF renders off the event loop in a bounded process or thread pool.
+    At most `max_workers + max_queue` jobs are admitted at once; further jobs are
+    rejected with RenderPoolSaturated instead of piling up behind a burst.
+    """
+
+    def __init__(self, executor_type: str = "process", max_workers: int = 2, max_queue: int = 8,
+                 timeout: Optional[float] = 30.0, default_output: Optional[str] = None):
+        if executor_type not in ("process", "thread"):
+            raise ValueError(f"Unknown executor type: {executor_type!r}")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.default_output = default_output
+        self._executor = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            executor_type=settings.PDF_RENDER_EXECUTOR,
+            max_workers=settings.PDF_RENDER_WORKERS,
+            max_queue=settings.PDF_RENDER_QUEUE_SIZE,
+            timeout=settings.PDF_RENDER_TIMEOUT_SECONDS,
+            default_output=settings.PDF_DEFAULT_OUTPUT,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_type == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                                         initargs=(self.default_output,))
+                except (OSError, NotImplementedError) as e:
+                    # e.g. AWS Lambda has no /dev/shm for multiprocessing primitives
+                    print(f"Process pool unavailable ({e}); rendering PDFs in threads instead.")
+                    self.executor_type = "thread"
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-render",
+                                                    initializer=_init_worker, initargs=(self.default_output,))
+        return self._executor
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    async def submit(self, fn, *args):
+        """Run `fn(*args)` in the pool and await its result, enforcing backpressure and the job timeout."""
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise RenderPoolSaturated(f"{self._pending} render jobs already in flight")
+            self._pending += 1
+            try:
+                executor = self._get_executor()
+                future = executor.submit(fn, *args)
+            except BrokenProcessPool:
+                self._pending -= 1
+                self._discard_executor(executor)
+                raise
+            except Exception:
+                self._pending -= 1
+                raise
+        # The slot is held until the job really finishes, even if the caller stops waiting
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise RenderTimeout(f"PDF render exceeded {self.timeout}s")
+        except BrokenProcessPool:
+            # A worker died mid-job
+            with self._lock:
+                self._discard_executor(executor)
+            raise
+
+    def _discard_executor(self, executor):
+        """Drop a pool a crashed worker has poisoned, so the next job starts a fresh one. Call with the lock held;
+        a pool already replaced by a concurrent job is left alone."""
+        if self._executor is executor:
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, json_data, order: Optional[List[str]] = None, fit_pages: Optional[int] = None,
+                     template: Optional[str] = None, output: Optional[str] = None) -> bytes:
+        return await self.submit(render_pdf, json_data, order, fit_pages, template, output)
+
+    async def render_with_metrics(self, json_data, order: Optional[List[str]] = None,
+                                  fit_pages: Optional[int] = None, template: Optional[str] = None,
+                                  output: Optional[str] = None) -> Tuple[bytes, RenderMetrics]:
+        return await self.submit(render_pdf_with_metrics, json_data, order, fit_pages, template, output)
+
+    async def thumbnail(self, json_data, width: int, order: Optional[List[str]] = None,
+                        template: Optional[str] = None, output: Optional[str] = None) -> Tuple[bytes, bytes]:
+        return await self.submit(render_thumbnail, json_data, width, order, template, output)
+
+    async def rasterize(self, pdf_bytes: bytes, width: int) -> bytes:
+        return await self.submit(rasterize_first_page, pdf_bytes, width)
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
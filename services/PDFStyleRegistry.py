@@ -0,0 +1,283 @@
+import copy
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+# Font name -> TTF file, registered once per process
+FONTS = {
+    'CMR10': 'data/fonts/cmunrm.ttf',  # Roman
+    'CMB10': 'data/fonts/cmunbx.ttf',  # Bold
+    'CMIT10': 'data/fonts/cmunti.ttf',  # Italic
+    'BodoniMT': 'data/fonts/bodoni-mt-regular.ttf',
+}
+
+
+class PDFStyleRegistry:
+    """
+    Process-wide registry of the fonts and paragraph styles used by JsonToPDFBuilder.
+    Fonts are parsed and the stylesheet is compiled once; every builder shares the
+    same read-only mapping, so a PDF request only pays for layout.
+    """
+    _lock = threading.Lock()
+    _fonts_registered = False
+    _styles: Mapping[str, ParagraphStyle] = None
+    _scaled = {}  # (variant, font, leading, spacing scale) -> derived stylesheet
+
+    @classmethod
+    def register_fonts(cls):
+        if cls._fonts_registered:
+            return
+        with cls._lock:
+            if cls._fonts_registered:
+                return
+            for font_name, font_path in FONTS.items():
+                pdfmetrics.registerFont(TTFont(font_name, font_path))
+            cls._fonts_registered = True
+
+    @classmethod
+    def get_styles(cls) -> Mapping[str, ParagraphStyle]:
+        """Return the shared stylesheet, compiling it on first use. Styles must not be mutated."""
+        styles = cls._styles
+        if styles is not None:
+            return styles
+        cls.register_fonts()
+        with cls._lock:
+            if cls._styles is None:
+                cls._styles = MappingProxyType(cls.compile_styles())
+            return cls._styles
+
+    @classmethod
+    def get_scaled_styles(cls, font_scale: float = 1.0, leading_scale: float = 1.0, spacing_scale: float = 1.0,
+                          variant: Optional[str] = None,
+                          overrides: Optional[Mapping[str, dict]] = None) -> Mapping[str, ParagraphStyle]:
+        """
+        Shared stylesheet with font size, leading and paragraph spacing scaled (used by
+        fit-to-pages), optionally with a template's attribute `overrides` applied first;
+        `variant` names those overrides in the cache. Derived sheets are cached, so the
+        same variant and scales share style objects.
+        """
+        key = (variant, font_scale, leading_scale, spacing_scale)
+        if key == (None, 1.0, 1.0, 1.0):
+            return cls.get_styles()
+        styles = cls._scaled.get(key)
+        if styles is not None:
+            return styles
+        base = cls.get_styles()
+        overrides = overrides or {}
+        with cls._lock:
+            if key not in cls._scaled:
+                cls._scaled[key] = MappingProxyType({
+                    name: cls._scale_style(cls._override_style(style, overrides.get(name)), *key[1:])
+                    for name, style in base.items()
+                })
+            return cls._scaled[key]
+
+    @staticmethod
+    def _override_style(style, attrs: Optional[dict]):
+        if not attrs:
+            return style
+        overridden = copy.copy(style)
+        for attr, value in attrs.items():
+            setattr(overridden, attr, value)
+        return overridden
+
+    @staticmethod
+    def _scale_style(style, font_scale, leading_scale, spacing_scale):
+        if (font_scale, leading_scale, spacing_scale) == (1.0, 1.0, 1.0):
+            return style
+        if not isinstance(style, ParagraphStyle):
+            return style  # list styles etc. are not used by the builder
+        scaled = copy.copy(style)
+        scaled.fontSize = style.fontSize * font_scale
+        scaled.leading = style.leading * font_scale * leading_scale
+        scaled.bulletFontSize = style.bulletFontSize * font_scale
+        scaled.spaceBefore = style.spaceBefore * spacing_scale
+        scaled.spaceAfter = style.spaceAfter * spacing_scale
+        return scaled
+
+    @classmethod
+    def warmup(cls):
+        """Eagerly register fonts and compile styles, e.g. at application startup."""
+        cls.get_styles()
+
+    @classmethod
+    def reset(cls):
+        """Drop the compiled stylesheet so the next request rebuilds it (benchmarks only)."""
+        with cls._lock:
+            cls._styles = None
+            cls._scaled = {}
+            cls._fonts_registered = False
+
+    @staticmethod
+    def compile_styles():
+        large = 12
+        small = 11
+        xSmall = 10
+        huge = 22.74
+        sheet = getSampleStyleSheet()
+        # —— Body text ——
+        sheet['BodyText'].fontName = 'CMR10'
+        sheet['BodyText'].fontSize = xSmall
+        sheet['BodyText'].leading = small
+        sheet['BodyText'].spaceAfter = 0
+        sheet['BodyText'].alignment = TA_JUSTIFY
+
+        # —— Name ——
+        sheet.add(ParagraphStyle(
+            name='Name',
+            fontName='BodoniMT',
+            fontSize=huge,
+            leading=10,
+            alignment=1,
+            spaceAfter=18,
+        ))
+        # —— Name ——
+        sheet.add(ParagraphStyle(
+            name='headerLoc',
+            fontName='CMR10',
+            fontSize=small,
+            leading=10,
+            alignment=TA_CENTER,
+            spaceAfter=8,
+
+        ))
+
+        # —— Contact line ——
+        sheet.add(ParagraphStyle(
+            name='HeaderInfo',
+            fontName='CMR10',
+            fontSize=xSmall,
+            leading=12,
+            alignment=1,
+            spaceAfter=12
+        ))
+
+        # —— Section heading (bold, uppercase) ——
+        sheet.add(ParagraphStyle(
+            name='SectionHeading',
+            fontName='CMB10',
+            fontSize=large,
+            leading=large,
+
+            spaceAfter=5,
+            alignment=0,
+            uppercase=True
+        ))
+
+        # —— Education table styles ——
+        sheet.add(ParagraphStyle(
+            name='EduInst',
+            fontName='CMB10',
+            fontSize=xSmall,
+            leading=8,
+        ))
+        sheet.add(ParagraphStyle(
+            name='EduDegree',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=8,
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='EduDate',
+            fontName='CMB10',
+            fontSize=xSmall,
+            leading=8,
+            alignment=2  # right
+        ))
+        sheet.add(ParagraphStyle(
+            name='EduLoc',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=8,
+            alignment=2,  # right
+            spaceAfter=1
+        ))
+
+        # —— Experience table styles ——
+        sheet.add(ParagraphStyle(
+            name='ExpTitle',
+            fontName='CMB10',
+            fontSize=small,
+            leading=8,
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExpRole',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=xSmall,
+
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExpDate',
+            fontName='CMB10',
+            fontSize=small,
+            leading=8,
+            alignment=2,  # right
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExpLoc',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=8,
+            alignment=2,  # right
+            spaceAfter=0
+        ))
+
+        # —— Extracurricular / Achievements styles ——
+        sheet.add(ParagraphStyle(
+            name='ExtraTitle',
+            fontName='CMB10',
+            fontSize=small,
+            leading=xSmall,
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExtraDesc',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=xSmall,
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExtraDate',
+            fontName='CMB10',
+            fontSize=small,
+            leading=xSmall,
+            alignment=2,  # right
+            spaceAfter=0
+        ))
+        sheet.add(ParagraphStyle(
+            name='ExtraLoc',
+            fontName='CMIT10',
+            fontSize=xSmall,
+            leading=xSmall,
+            alignment=2,  # right
+            spaceAfter=6
+        ))
+        sheet.add(ParagraphStyle(
+            name='skill',
+            fontName='CMR10',
+            fontSize=xSmall,
+            leading=small,
+            spaceBefore=2,
+
+            spaceAfter=0,
+        ))
+
+        # —— Tight bullet paragraphs (experience / project points) ——
+        sheet.add(ParagraphStyle(
+            'BulletTight',
+            parent=sheet['BodyText'],
+            spaceBefore=4,
+            spaceAfter=0,
+            leading=sheet['BodyText'].fontSize * 1.1
+        ))
+        return dict(sheet.byName)
@@ -0,0 +1,51 @@
+from typing import List, Optional
+
+from utils.ContentCache import ContentCache, content_hash
+
+DEFAULT_THUMBNAIL_WIDTH = 240  # px; list pages show thumbnails at ~120 CSS px on 2x screens
+MAX_THUMBNAIL_WIDTH = 1024
+
+
+def rasterize_first_page(pdf_bytes: bytes, width: int = DEFAULT_THUMBNAIL_WIDTH) -> bytes:
+    """PNG of page 1 of a PDF, scaled to `width` pixels wide."""
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page = doc[0]
+        zoom = width / page.rect.width
+        pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return pixmap.tobytes("png")
+
+
+class ThumbnailCache:
+    """
+    Cache of first-page PNG thumbnails keyed by a canonical hash of
+    resume_data + width + section order + template name and version, so an unchanged resume is
+    never rendered or rasterized twice.
+    """
+
+    def __init__(self, cache: ContentCache):
+        self.cache = cache
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(ContentCache(
+            max_bytes=settings.THUMBNAIL_CACHE_MAX_BYTES,
+            disk_dir=settings.THUMBNAIL_CACHE_DISK_DIR,
+            max_disk_bytes=settings.THUMBNAIL_CACHE_MAX_DISK_BYTES,
+        ))
+
+    @staticmethod
+    def key_for(resume_data: dict, width: int, order: Optional[List[str]] = None,
+                template: Optional[str] = None) -> str:
+        from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+        from services.ResumeTemplate import DEFAULT_TEMPLATE
+
+        return content_hash("thumbnail", JsonToPDFBuilder.TEMPLATE_VERSION, resume_data, width,
+                            order or DEFAULT_SECTION_ORDER, template or DEFAULT_TEMPLATE)
+
+    def get(self, key: str):
+        return self.cache.get(key)
+
+    def put(self, key: str, png_bytes: bytes):
+        self.cache.put(key, png_bytes)
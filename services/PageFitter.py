@@ -0,0 +1,98 @@
+from typing import Callable, List, Optional
+
+import io
+
+from reportlab import rl_config
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Flowable
+
+# Fit-to-pages tightens the layout in FIT_STEPS steps: the first half shrinks vertical
+# spacing, the second half shrinks font size and leading (spacing stays at its minimum).
+FIT_STEPS = 8
+MIN_SPACING_SCALE = 0.4
+MIN_FONT_SCALE = 0.85
+MIN_LEADING_SCALE = 0.95  # on top of the font scale
+
+
+class PageFitter:
+    """
+    Finds the least-tightened layout that lays a story out in N pages.
+    Page counts come from wrap()/split() alone, mirroring how a platypus Frame fills
+    pages, so the search never draws anything and the real doc.build runs once.
+    """
+
+    @staticmethod
+    def layout(step: int):
+        """(font_scale, leading_scale, spacing_scale) for a step in 0..FIT_STEPS."""
+        half = FIT_STEPS // 2
+        spacing_t = min(step, half) / half
+        font_t = max(step - half, 0) / (FIT_STEPS - half)
+        return (
+            1 - (1 - MIN_FONT_SCALE) * font_t,
+            1 - (1 - MIN_LEADING_SCALE) * font_t,
+            1 - (1 - MIN_SPACING_SCALE) * spacing_t,
+        )
+
+    @staticmethod
+    def count_pages(story: List[Flowable], width: float, height: float, max_pages: Optional[int] = None) -> int:
+        """
+        Pages `story` needs in a frame with the given available width and height.
+        With `max_pages`, stops measuring (and returns max_pages + 1) once the story overflows it.
+        """
+        overlap_space = rl_config.overlapAttachedSpace
+        # Some flowables (lists, tables) measure text through .canv; this one is never drawn on or saved
+        canv = Canvas(io.BytesIO())
+        pages = 1
+        remaining = height
+        at_top = True
+        prev_space_after = 0
+        pending = list(reversed(story))
+        while pending:
+            flowable = pending.pop()
+            flowable.canv = canv
+            space_before = 0
+            if not at_top:
+                space_before = flowable.getSpaceBefore()
+                if overlap_space:
+                    space_before = max(space_before - prev_space_after, 0)
+            avail = remaining - space_before
+            if avail > 0:
+                _, h = flowable.wrap(width, avail)
+                if h <= avail + 1e-6:  # same tolerance as Frame._add
+                    prev_space_after = flowable.getSpaceAfter()
+                    remaining = avail - h - prev_space_after
+                    at_top = at_top and h + space_before + prev_space_after == 0
+                    continue
+                parts = flowable.split(width, avail)
+                if parts:
+                    pending.extend(reversed(parts))
+                    continue
+            if at_top:
+                # Too large even for an empty page; the real build would fail or overflow here too
+                continue
+            pages += 1
+            if max_pages is not None and pages > max_pages:
+                break
+            remaining = height
+            at_top = True
+            prev_space_after = 0
+            pending.append(flowable)
+        return pages
+
+    @staticmethod
+    def search(measure: Callable[[int], int], pages: int) -> int:
+        """
+        Smallest step whose layout fits in `pages`, given measure(step) -> page count.
+        Binary search over the steps: at most 1 + log2(FIT_STEPS) measurements.
+        Returns FIT_STEPS (the tightest layout) if nothing fits.
+        """
+        if measure(0) <= pages:
+            return 0
+        too_long, fits = 0, FIT_STEPS
+        while fits - too_long > 1:
+            mid = (too_long + fits) // 2
+            if measure(mid) <= pages:
+                fits = mid
+            else:
+                too_long = mid
+        return fits
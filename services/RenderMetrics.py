@@ -0,0 +1,70 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+
+class RenderMetrics:
+    """
+    Timings and counts of one PDF render: time and top-level flowables per section
+    renderer, the fit-to-pages search, doc.build and the resulting page count.
+    A plain picklable object, so it comes back from process-pool workers with the PDF.
+    """
+
+    def __init__(self):
+        self.sections: List[dict] = []  # in render order: section, ms, flowables, cached
+        self.timings: Dict[str, float] = {}  # phase -> ms (fit, compose, build, total, queue)
+        self.pages: Optional[int] = None
+        self.pdf_bytes: Optional[int] = None
+        self.cache_hit: Optional[bool] = None  # served from the rendered-PDF cache
+
+    def add_section(self, key: str, ms: float, flowables: int, cached: bool):
+        self.sections.append({"section": key, "ms": round(ms, 3), "flowables": flowables, "cached": cached})
+
+    @contextmanager
+    def time(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = round(self.timings.get(phase, 0.0) + (time.perf_counter() - start) * 1000, 3)
+
+    def merge(self, other: 'RenderMetrics'):
+        """Take over what a worker measured; phases timed here (e.g. queue) are kept."""
+        self.sections = other.sections
+        self.timings = {**other.timings, **self.timings}
+        self.pages = other.pages
+        self.pdf_bytes = other.pdf_bytes
+
+    def as_dict(self) -> dict:
+        return {
+            "cache_hit": self.cache_hit,
+            "pages": self.pages,
+            "pdf_bytes": self.pdf_bytes,
+            "timings_ms": self.timings,
+            "sections": self.sections,
+        }
+
+    def log(self, **context):
+        """One structured log line per render."""
+        print(json.dumps({"event": "pdf_render", **context, **self.as_dict()}, default=str))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: render phases, then one `section-<key>` entry per rendered section."""
+        entries = []
+        if self.cache_hit:
+            entries.append('cache;desc="hit"')
+        for phase, ms in self.timings.items():
+            desc = f';desc="{self.pages} page{"s" if self.pages != 1 else ""}"' if phase == 'build' and self.pages else ''
+            entries.append(f'{phase};dur={ms:.1f}{desc}')
+        for section in self.sections:
+            if not section["flowables"]:
+                continue  # absent from this resume
+            entries.append(f'section-{section["section"]};dur={section["ms"]:.1f};'
+                           f'desc="{section["flowables"]} flowables{", cached" if section["cached"] else ""}"')
+        return ', '.join(entries)
+
+
+def timed(metrics: Optional[RenderMetrics], phase: str):
+    """`metrics.time(phase)`, or a no-op when the render is not instrumented."""
+    return nullcontext() if metrics is None else metrics.time(phase)
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, List, Tuple
+
+from services.PDFOptimizer import DEFAULT_OUTPUT_MODE
+from utils.ContentCache import ContentCache, content_hash
+
+
+class RenderedPDFCache:
+    """
+    Cache of rendered resume PDFs keyed by a canonical hash of
+    resume_data + section order + fit-to-pages target + template name and version + output mode.
+    Also remembers which key each stored resume was last served under, so
+    updating or deleting a resume can evict its artifact right away; only the
+    `max_tracked_resumes` most recently rendered resumes are remembered (the PDF of
+    one forgotten earlier simply ages out of the LRU).
+    """
+
+    def __init__(self, cache: ContentCache, max_tracked_resumes: int = 10000):
+        self.cache = cache
+        self.max_tracked_resumes = max_tracked_resumes
+        self._resume_keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(ContentCache(
+            max_bytes=settings.PDF_CACHE_MAX_BYTES,
+            disk_dir=settings.PDF_CACHE_DISK_DIR,
+            max_disk_bytes=settings.PDF_CACHE_MAX_DISK_BYTES,
+        ))
+
+    @staticmethod
+    def key_for(resume_data: dict, order: Optional[List[str]] = None, fit_pages: Optional[int] = None,
+                template: Optional[str] = None, output: Optional[str] = None) -> str:
+        # Deferred so that importing the cache (at app start) does not load ReportLab
+        from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+        from services.ResumeTemplate import DEFAULT_TEMPLATE
+
+        return content_hash("pdf", JsonToPDFBuilder.TEMPLATE_VERSION, resume_data, order or DEFAULT_SECTION_ORDER,
+                            fit_pages, template or DEFAULT_TEMPLATE, output or DEFAULT_OUTPUT_MODE)
+
+    def get(self, resume_data: dict, order: Optional[List[str]] = None,
+            resume_ref: Optional[Tuple[str, str]] = None, fit_pages: Optional[int] = None,
+            template: Optional[str] = None, output: Optional[str] = None) -> Optional[bytes]:
+        key = self.key_for(resume_data, order, fit_pages, template, output)
+        pdf_bytes = self.cache.get(key)
+        if pdf_bytes is not None and resume_ref:
+            self._track(resume_ref, key)
+        return pdf_bytes
+
+    def put(self, resume_data: dict, order: Optional[List[str]], pdf_bytes: bytes,
+            resume_ref: Optional[Tuple[str, str]] = None, fit_pages: Optional[int] = None,
+            template: Optional[str] = None, output: Optional[str] = None):
+        key = self.key_for(resume_data, order, fit_pages, template, output)
+        self.cache.put(key, pdf_bytes)
+        if resume_ref:
+            self._track(resume_ref, key)
+
+    def _track(self, resume_ref: Tuple[str, str], key: str):
+        with self._lock:
+            self._resume_keys[resume_ref] = key
+            self._resume_keys.move_to_end(resume_ref)
+            while len(self._resume_keys) > self.max_tracked_resumes:
+                self._resume_keys.popitem(last=False)
+
+    def invalidate_resume(self, user_id: str, resume_id: str):
+        """Drop the PDF last rendered for a stored resume (called on update / delete)."""
+        with self._lock:
+            key = self._resume_keys.pop((user_id, resume_id), None)
+        if key:
+            self.cache.discard(key)
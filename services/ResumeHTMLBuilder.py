@@ -0,0 +1,272 @@
+import re
+import threading
+from html import escape
+from typing import Callable, Dict, List, Optional
+
+from services.IconRegistry import IconRegistry
+from services.JsonToPDFBuilder import JsonToPDFBuilder, DEFAULT_SECTION_ORDER
+from services.ResumeTemplate import BINDINGS, ResumeTemplate, format_fields, strip_text, field_value
+
+# PDF font name -> CSS font declaration (CMU fonts if installed, any serif otherwise)
+CSS_FONTS = {
+    'CMR10': "font-family: 'CMU Serif', 'Latin Modern Roman', serif;",
+    'CMB10': "font-family: 'CMU Serif', 'Latin Modern Roman', serif; font-weight: bold;",
+    'CMIT10': "font-family: 'CMU Serif', 'Latin Modern Roman', serif; font-style: italic;",
+    'BodoniMT': "font-family: 'Bodoni MT', 'Bodoni 72', serif;",
+    'Helvetica': "font-family: Helvetica, Arial, sans-serif;",
+    'Helvetica-Bold': "font-family: Helvetica, Arial, sans-serif; font-weight: bold;",
+    'Helvetica-Oblique': "font-family: Helvetica, Arial, sans-serif; font-style: italic;",
+}
+CSS_ALIGN = {0: 'left', 1: 'center', 2: 'right', 4: 'justify'}
+
+# Letter page, 0.3in margins; two-column rows use the PDF's 1.94 : 1 split
+PAGE_CSS = """
+.resume { width: 7.9in; padding: 0.3in; margin: 0 auto; background: #fff; color: #000; }
+.resume p { margin: 0; }
+.resume .row { display: grid; grid-template-columns: 1.94fr 1fr; padding: 3pt 0; }
+.resume ul { margin: 0; padding-left: 28pt; }
+.resume img { width: 10pt; height: 10pt; vertical-align: baseline; }
+"""
+
+# The ReportLab paragraph markup templates use that HTML has no equivalent for
+_FONT_TAG = re.compile(r'<font (name|color)="([^"]*)">')
+
+
+def _markup(text: str) -> str:
+    """A template's ReportLab markup (<font name=...>, <font color=...>) as HTML; <a>, <u>, <b> carry over."""
+    def span(match):
+        attr, value = match.groups()
+        css = CSS_FONTS.get(value, '') if attr == 'name' else f'color: {value};'
+        return f'<span style="{css}">'
+    return _FONT_TAG.sub(span, text).replace('</font>', '</span>')
+
+
+def _escaped(value):
+    """Entry values as they go into the markup: text escaped, list items escaped and comma-joined."""
+    if isinstance(value, list):
+        return ', '.join(escape(str(item)) for item in value)
+    return escape(value)
+
+
+class ResumeHTMLBuilder:
+    """
+    Lightweight HTML preview of a resume for the editor. It is driven by the same
+    compiled ResumeTemplate spec and section_data() as the PDF builder: section kinds,
+    titles, required fields, bindings, markup and style overrides all come from
+    data/templates, so the preview cannot drift from the PDF. A template using a
+    section kind or block type the preview has no HTML for is refused with ValueError.
+    """
+    _lock = threading.Lock()
+    _stylesheets: Dict[str, str] = {}
+
+    def __init__(self, template: Optional[str] = None):
+        self.template = ResumeTemplate.get(template)
+        self.default_order = list(DEFAULT_SECTION_ORDER)
+        spec = self.template.spec
+        rule = spec.get('rule', {})
+        self.rule = (f'<hr style="border: 0; border-top: {rule.get("thickness", 0.5)}pt solid '
+                     f'{rule.get("color", "black")}; margin: 1pt 0;">')
+        compilers = {
+            'contact': self._compile_contact,
+            'text': self._compile_text,
+            'lines': self._compile_lines,
+            'entries': self._compile_entries,
+        }
+        self.renderers: Dict[str, Callable] = {}
+        for key, section in spec['sections'].items():
+            compiler = compilers.get(section['kind'])
+            if compiler is None:
+                raise ValueError(f"Template {self.template.name!r} has a {section['kind']!r} section "
+                                 f"the HTML preview cannot render")
+            self.renderers[key] = compiler(section)
+
+    def stylesheet(self) -> str:
+        """CSS generated once per template from its PDF paragraph styles (overrides included)."""
+        name = self.template.name
+        css = self._stylesheets.get(name)
+        if css is not None:
+            return css
+        rules = [PAGE_CSS]
+        for style_name, style in self.template.styles().items():
+            if not hasattr(style, 'fontSize'):
+                continue
+            rules.append(
+                f".resume .s-{style_name} {{ {CSS_FONTS.get(style.fontName, '')} font-size: {style.fontSize}pt; "
+                f"line-height: {max(style.leading, style.fontSize)}pt; "
+                f"text-align: {CSS_ALIGN.get(style.alignment, 'left')}; "
+                f"color: #{style.textColor.hexval()[2:]}; "
+                f"margin: {style.spaceBefore}pt 0 {style.spaceAfter}pt 0; }}"
+            )
+        rules.append(".resume .s-SectionHeading { text-transform: uppercase; }")
+        css = '\n'.join(rules)
+        with self._lock:
+            self._stylesheets[name] = css
+        return css
+
+    @staticmethod
+    def p(text, style):
+        """A paragraph of already escaped markup."""
+        return f'<p class="s-{style}">{text}</p>'
+
+    @staticmethod
+    def spacer(height):
+        return f'<div style="height: {height}pt"></div>' if height else ''
+
+    @staticmethod
+    def bullet_list(items, style, list_params):
+        margin = f'margin: {list_params.get("spaceBefore", 0)}pt 0 {list_params.get("spaceAfter", 0)}pt 0;'
+        lis = ''.join(f'<li><p class="s-{style}">{item}</p></li>' for item in items)
+        return f'<ul style="{margin}">{lis}</ul>'
+
+    def _heading(self, title: str):
+        return [self.p(escape(title), 'SectionHeading'), self.rule]
+
+    # --- section compilers: each returns render(data) -> list of HTML fragments, like ResumeTemplate's ---
+    def _compile_contact(self, spec):
+        separator = spec.get('separator', '&nbsp;&nbsp;&nbsp;&nbsp;')
+
+        def icon(icon_name):
+            return f'<img src="{IconRegistry.data_uri(IconRegistry.icon_src(icon_name))}" alt="">'
+
+        def render(data):
+            if not data:
+                return []
+            name, location, phone, email = (strip_text(data.get(k)) for k in ('name', 'location', 'phone', 'email'))
+            if not (name and location and phone and email):
+                return []
+            parts = [
+                f'{icon("phone")}&nbsp;{escape(phone)}',
+                f'{icon("mail")}&nbsp;<a href="mailto:{escape(email)}"><u>{escape(email)}</u></a>',
+            ]
+            for soc in data.get('socials') or []:
+                soc_name = strip_text(soc.get('name'))
+                link = strip_text(soc.get('link'))
+                if soc_name and link:
+                    parts.append(f'{icon(soc_name)}&nbsp;<a href="{escape(link)}"><u>{escape(soc_name)}</u></a>')
+            return [self.p(escape(name), 'Name'), self.p(escape(location), 'headerLoc'),
+                    self.p(separator.join(parts), 'HeaderInfo')]
+        return render
+
+    def _compile_text(self, spec):
+        heading = self._heading(spec['title'])
+        style = spec.get('style', 'BodyText')
+        space_after = spec.get('space_after', 0)
+
+        def render(data):
+            text = strip_text(data or '')
+            if not text:
+                return []
+            return heading + [self.p(escape(text), style), self.spacer(space_after)]
+        return render
+
+    def _compile_lines(self, spec):
+        heading = self._heading(spec['title'])
+        text = _markup(spec['text'])
+        required = spec['required']
+        fields = sorted(set(required) | set(format_fields(spec['text'])))
+        style = spec.get('style', 'BodyText')
+        space_after = spec.get('space_after', 0)
+
+        def render(rows):
+            if not rows:
+                return []
+            html = list(heading)
+            for row in rows:
+                values = {field: field_value(row, field) for field in fields}
+                if not all(values[field] for field in required):
+                    continue
+                html.append(self.p(text.format_map({k: _escaped(v) for k, v in values.items()}), style))
+            html.append(self.spacer(space_after))
+            return html
+        return render
+
+    def _compile_entries(self, spec):
+        heading = self._heading(spec['title'])
+        required = spec['required']
+        computed = [(name, BINDINGS[binding[0]], binding[1:]) for name, binding in spec.get('computed', {}).items()]
+        header = [(_markup(text), style) for text, style in spec['header']]
+        computed_names = {name for name, _, _ in computed}
+        fields = set(required)
+        for _, _, args in computed:
+            fields.update(args)
+        for text, _ in spec['header']:
+            fields.update(f for f in format_fields(text) if f not in computed_names)
+        fields = sorted(fields)
+        body = [self._compile_block(block) for block in spec.get('body', [])]
+        after_header = spec.get('space_after_header', 0)
+        after_entry = spec.get('space_after_entry', 0)
+        space_after = spec.get('space_after', 0)
+
+        def render(entries):
+            if not entries:
+                return []
+            html = list(heading)
+            for entry in entries:
+                values = {field: field_value(entry, field) for field in fields}
+                if not all(values[field] for field in required):
+                    continue
+                values = {k: _escaped(v) for k, v in values.items()}
+                for name, binding, args in computed:
+                    values[name] = binding(values, *args)
+                cells = [self.p(text.format_map(values), style) for text, style in header]
+                html.append(f'<div class="row">{"".join(cells)}</div>')
+                html.append(self.spacer(after_header))
+                for block in body:
+                    html.extend(block(entry))
+                html.append(self.spacer(after_entry))
+            html.append(self.spacer(space_after))
+            return html
+        return render
+
+    def _compile_block(self, spec):
+        field = spec['field']
+        list_params = spec.get('list', {})
+        kind = spec['type']
+
+        if kind == 'bullets':
+            style = spec.get('style', 'BulletTight')
+
+            def block(entry):
+                points = entry.get(field) or []
+                return [self.bullet_list([escape(pt) for pt in points], style, list_params)] if points else []
+            return block
+
+        if kind == 'links':
+            item, text = _markup(spec['item']), _markup(spec['text'])
+            style = spec.get('style', 'BulletTight')
+
+            def block(entry):
+                links = [item.format(name=escape(src['name']), link=escape(src['link']))
+                         for src in entry.get(field) or [] if src.get('name') and src.get('link')]
+                if not links:
+                    return []
+                return [self.bullet_list([text.format(items=', '.join(links))], style, list_params)]
+            return block
+
+        if kind == 'line':
+            text = _markup(spec['text'])
+            style = spec.get('style', 'BodyText')
+
+            def block(entry):
+                items = entry.get(field) or []
+                return [self.p(text.format(items=_escaped(items)), style)] if items else []
+            return block
+
+        raise ValueError(f"Template {self.template.name!r} has a {kind!r} block the HTML preview cannot render")
+
+    def build(self, data, order: Optional[List[str]] = None) -> str:
+        """Render `data` as an HTML fragment (with its own <style>) in the same section order as the PDF."""
+        section_data = JsonToPDFBuilder.section_data(data)
+        html = [f'<style>{self.stylesheet()}</style>', '<div class="resume">']
+        for key in order or self.default_order:
+            renderer = self.renderers.get(key)
+            if not renderer:
+                raise ValueError(f"Unknown section key: {key!r}")
+            html.extend(fragment for fragment in renderer(section_data[key]) if fragment)
+        html.append('</div>')
+        return '\n'.join(html)
+
+    def build_page(self, data, order: Optional[List[str]] = None, title: Optional[str] = None) -> str:
+        """Standalone HTML document wrapping build(), e.g. for an iframe."""
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{escape(title or "Resume")}</title>'
+                f'</head><body>{self.build(data, order)}</body></html>')
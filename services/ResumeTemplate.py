@@ -0,0 +1,289 @@
+import json
+import os
+import string
+import threading
+from typing import Callable, Dict, List, Mapping, Optional
+
+from reportlab.lib.colors import toColor
+from reportlab.platypus import HRFlowable, ListFlowable, ListItem
+
+from services.EntryHeader import EntryHeader
+from services.IconRegistry import IconRegistry
+from services.PDFStyleRegistry import PDFStyleRegistry
+
+TEMPLATE_DIR = 'data/templates'
+DEFAULT_TEMPLATE = 'classic'
+
+# Computed field bindings: "computed": {"span": ["range", "start_date", "end_date"]}
+BINDINGS: Dict[str, Callable] = {
+    # "start – end", or just start when there is no end
+    'range': lambda v, start, end: f"{v[start]} – {v[end]}" if v[end] else v[start],
+    # "start – end" only when both are set, else whatever start is
+    'range_if_both': lambda v, start, end: f"{v[start]} – {v[end]}" if v[start] and v[end] else v[start] or '',
+    # first non-empty field
+    'first': lambda v, *fields: next((v[f] for f in fields if v[f]), ''),
+}
+
+
+def strip_text(value):
+    return value.strip() if isinstance(value, str) else ''
+
+
+def field_value(entry: dict, field: str):
+    """Stripped string for scalar fields; lists (bullets, skill items) are returned as-is."""
+    value = entry.get(field)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, list):
+        return value
+    return ''
+
+
+def format_fields(text: str) -> List[str]:
+    return [name for _, name, _, _ in string.Formatter().parse(text) if name]
+
+
+class ResumeTemplate:
+    """
+    A visual resume template compiled from its declarative spec in data/templates/<name>.json:
+    sections -> field bindings -> styles. Compiling resolves inheritance ("extends"),
+    style overrides and bindings once into one render function per section; compiled
+    templates are cached per process, so adding a template adds no render code.
+    """
+    _lock = threading.Lock()
+    _compiled: Dict[str, 'ResumeTemplate'] = {}
+
+    def __init__(self, spec: dict):
+        # The resolved spec, for other renderers of the same template (services.ResumeHTMLBuilder)
+        self.spec = spec
+        self.name = spec['name']
+        self.description = spec.get('description', '')
+        # Style name -> attribute overrides applied on top of the shared PDF stylesheet
+        self.style_overrides = {
+            style: {attr: toColor(value) if attr.endswith('Color') else value for attr, value in attrs.items()}
+            for style, attrs in spec.get('styles', {}).items()
+        }
+        rule = spec.get('rule', {})
+        self.rule_thickness = rule.get('thickness', 0.5)
+        self.rule_color = toColor(rule.get('color', 'black'))
+        self.bullet = dict(spec.get('bullet', {}))
+        compilers = {
+            'contact': self._compile_contact,
+            'text': self._compile_text,
+            'lines': self._compile_lines,
+            'entries': self._compile_entries,
+        }
+        self.renderers: Dict[str, Callable] = {
+            key: compilers[section['kind']](section) for key, section in spec['sections'].items()
+        }
+
+    # --- loading ---
+    @staticmethod
+    def available() -> List[str]:
+        return sorted(os.path.splitext(f)[0] for f in os.listdir(TEMPLATE_DIR) if f.endswith('.json'))
+
+    @classmethod
+    def load_spec(cls, name: str) -> dict:
+        path = os.path.join(TEMPLATE_DIR, f'{name}.json')
+        if not os.path.isfile(path):
+            raise ValueError(f"Unknown template: {name!r}")
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        parent = spec.pop('extends', None)
+        if not parent:
+            return spec
+        merged = cls.load_spec(parent)
+        for key, value in spec.items():
+            if key == 'styles':
+                for style, attrs in value.items():
+                    merged['styles'][style] = {**merged['styles'].get(style, {}), **attrs}
+            elif key == 'sections':
+                for section, attrs in value.items():
+                    merged['sections'][section] = {**merged['sections'].get(section, {}), **attrs}
+            elif key in ('rule', 'bullet'):
+                merged[key] = {**merged.get(key, {}), **value}
+            else:
+                merged[key] = value
+        return merged
+
+    @classmethod
+    def get(cls, name: Optional[str] = None) -> 'ResumeTemplate':
+        """Compiled template by name (default: classic), compiled on first use."""
+        name = name or DEFAULT_TEMPLATE
+        template = cls._compiled.get(name)
+        if template is not None:
+            return template
+        with cls._lock:
+            if name not in cls._compiled:
+                cls._compiled[name] = cls(cls.load_spec(name))
+            return cls._compiled[name]
+
+    def styles(self, font_scale: float = 1.0, leading_scale: float = 1.0,
+               spacing_scale: float = 1.0) -> Mapping:
+        return PDFStyleRegistry.get_scaled_styles(font_scale, leading_scale, spacing_scale,
+                                                  variant=self.name if self.style_overrides else None,
+                                                  overrides=self.style_overrides)
+
+    # --- section compilers: each returns render(ctx, data) ---
+    def _heading(self, title: str):
+        thickness, color = self.rule_thickness, self.rule_color
+
+        def heading(ctx):
+            ctx.story.append(ctx.paragraph(title, ctx.styles['SectionHeading']))
+            ctx.story.append(HRFlowable(width="100%", thickness=thickness, color=color))
+        return heading
+
+    def _compile_contact(self, spec):
+        separator = spec.get('separator', '&nbsp;&nbsp;&nbsp;&nbsp;')
+
+        def render(ctx, data):
+            """name, location, phone and email are required; socials are optional."""
+            if not data:
+                return
+            name = strip_text(data.get('name'))
+            location = strip_text(data.get('location'))
+            phone = strip_text(data.get('phone'))
+            email = strip_text(data.get('email'))
+            if not (name and location and phone and email):
+                return
+
+            ctx.story.append(ctx.paragraph(name, ctx.styles['Name']))
+            ctx.story.append(ctx.paragraph(location, ctx.styles['headerLoc']))
+            parts = [
+                f'<img src="{IconRegistry.icon_src("phone")}" width="10" height="10"/>&nbsp;{phone}',
+                f'<img src="{IconRegistry.icon_src("mail")}" width="10" height="10"/>&nbsp;'
+                f'<a href="mailto:{email}"><u>{email}</u></a>',
+            ]
+            for soc in data.get('socials') or []:
+                soc_name = strip_text(soc.get('name'))
+                link = strip_text(soc.get('link'))
+                if not (soc_name and link):
+                    continue
+                parts.append(
+                    f'<img src="{IconRegistry.icon_src(soc_name)}" width="10" height="10"/>&nbsp;'
+                    f'<a href="{link}"><u>{soc_name}</u></a>'
+                )
+            ctx.story.append(ctx.paragraph(separator.join(parts), ctx.styles['HeaderInfo']))
+        return render
+
+    def _compile_text(self, spec):
+        heading = self._heading(spec['title'])
+        style = spec.get('style', 'BodyText')
+        space_after = spec.get('space_after', 0)
+
+        def render(ctx, data):
+            text = strip_text(data or '')
+            if not text:
+                return
+            heading(ctx)
+            ctx.story.append(ctx.paragraph(text, ctx.styles[style]))
+            if space_after:
+                ctx.story.append(ctx.spacer(space_after))
+        return render
+
+    def _compile_lines(self, spec):
+        """One paragraph per item, e.g. "<b>Languages:</b> Python, Java"; list fields are comma-joined."""
+        heading = self._heading(spec['title'])
+        text = spec['text']
+        required = spec['required']
+        fields = sorted(set(required) | set(format_fields(text)))
+        style = spec.get('style', 'BodyText')
+        space_after = spec.get('space_after', 0)
+
+        def render(ctx, rows):
+            if not rows:
+                return
+            heading(ctx)
+            paragraph_style = ctx.styles[style]
+            for row in rows:
+                values = {field: field_value(row, field) for field in fields}
+                if not all(values[field] for field in required):
+                    continue
+                values = {k: ', '.join(v) if isinstance(v, list) else v for k, v in values.items()}
+                ctx.story.append(ctx.paragraph(text.format_map(values), paragraph_style))
+            if space_after:
+                ctx.story.append(ctx.spacer(space_after))
+        return render
+
+    def _compile_entries(self, spec):
+        """Dated entries: a two-row header, then optional body blocks (bullets, links, lines)."""
+        heading = self._heading(spec['title'])
+        required = spec['required']
+        computed = [(name, BINDINGS[binding[0]], binding[1:]) for name, binding in spec.get('computed', {}).items()]
+        header = [(text, style) for text, style in spec['header']]
+        computed_names = {name for name, _, _ in computed}
+        fields = set(required)
+        for _, _, args in computed:
+            fields.update(args)
+        for text, _ in header:
+            fields.update(f for f in format_fields(text) if f not in computed_names)
+        fields = sorted(fields)
+        body = [self._compile_block(block) for block in spec.get('body', [])]
+        after_header = spec.get('space_after_header', 0)
+        after_entry = spec.get('space_after_entry', 0)
+        space_after = spec.get('space_after', 0)
+
+        def render(ctx, entries):
+            if not entries:
+                return
+            heading(ctx)
+            styles = ctx.styles
+            for entry in entries:
+                values = {field: field_value(entry, field) for field in fields}
+                if not all(values[field] for field in required):
+                    continue
+                for name, binding, args in computed:
+                    values[name] = binding(values, *args)
+                cells = [ctx.paragraph(text.format_map(values), styles[style]) for text, style in header]
+                ctx.story.append(EntryHeader(((cells[0], cells[1]), (cells[2], cells[3])), ctx.columns))
+                if after_header:
+                    ctx.story.append(ctx.spacer(after_header))
+                for block in body:
+                    block(ctx, entry)
+                if after_entry:
+                    ctx.story.append(ctx.spacer(after_entry))
+            if space_after:
+                ctx.story.append(ctx.spacer(space_after))
+        return render
+
+    def _compile_block(self, spec):
+        field = spec['field']
+        bullet = self.bullet
+        list_params = spec.get('list', {})
+        kind = spec['type']
+
+        if kind == 'bullets':
+            style = spec.get('style', 'BulletTight')
+
+            def block(ctx, entry):
+                points = entry.get(field) or []
+                if not points:
+                    return
+                bullet_style = ctx.styles[style]
+                items = [ListItem(ctx.paragraph(pt, bullet_style), **bullet) for pt in points]
+                ctx.story.append(ListFlowable(items, bulletType='bullet', **list_params))
+            return block
+
+        if kind == 'links':
+            item, text = spec['item'], spec['text']
+            style = spec.get('style', 'BulletTight')
+
+            def block(ctx, entry):
+                links = [item.format_map(src) for src in entry.get(field) or [] if src.get('name') and src.get('link')]
+                if not links:
+                    return
+                paragraph = ctx.paragraph(text.format(items=', '.join(links)), ctx.styles[style])
+                ctx.story.append(ListFlowable([ListItem(paragraph, **bullet)], bulletType='bullet', **list_params))
+            return block
+
+        if kind == 'line':
+            text = spec['text']
+            style = spec.get('style', 'BodyText')
+
+            def block(ctx, entry):
+                items = entry.get(field) or []
+                if items:
+                    ctx.story.append(ctx.paragraph(text.format(items=', '.join(items)), ctx.styles[style]))
+            return block
+
+        raise ValueError(f"Unknown block type in template: {kind!r}")
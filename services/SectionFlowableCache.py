@@ -0,0 +1,82 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from reportlab.platypus import Paragraph
+
+from services.IconRegistry import IconRegistry
+
+
+class MemoParagraph(Paragraph):
+    """
+    Paragraph that memoizes its line breaking per available width.
+    Clones made with copy.copy share the parsed fragments and the layout memo,
+    so re-rendering an unchanged paragraph skips both markup parsing and wrap().
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._layouts = {}
+        # Inline <img> readers decode lazily on first draw; swap in the shared pre-decoded icon,
+        # or decode now, before clones are shared between threads, so concurrent renders
+        # only ever read the decoded data.
+        for frag in self.frags or ():
+            defn = getattr(frag, 'cbDefn', None)
+            if getattr(defn, 'kind', None) == 'img':
+                shared = IconRegistry.reader_for(defn.src)
+                if shared is not None:
+                    defn.image = shared
+                    continue
+                defn.image.getRGBData()
+                if defn.image._dataA is not None:
+                    defn.image._dataA.getRGBData()
+
+    def wrap(self, availWidth, availHeight):
+        layout = self._layouts.get(availWidth)
+        if layout is None:
+            width, height = super().wrap(availWidth, availHeight)
+            self._layouts[availWidth] = (width, height, self._wrapWidths, self.blPara)
+            return width, height
+        self.width, self.height, self._wrapWidths, self.blPara = layout
+        return self.width, self.height
+
+
+class SectionFlowableCache:
+    """
+    Process-wide LRU of section paragraphs keyed by a hash of the section's JSON.
+    Each entry maps (text, style) -> MemoParagraph prototype; renderers hand out
+    clones, so an edit only re-parses and re-wraps the section that changed.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            paragraphs = self._entries.get(key)
+            if paragraphs is not None:
+                self._entries.move_to_end(key)
+            return paragraphs
+
+    def put(self, key: str, paragraphs: dict):
+        with self._lock:
+            self._entries[key] = paragraphs
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def paragraph(paragraphs: dict, text, style) -> MemoParagraph:
+        """Clone of the cached paragraph for (text, style), creating the prototype on first use."""
+        key = (text, style)
+        proto = paragraphs.get(key)
+        if proto is None:
+            proto = paragraphs[key] = MemoParagraph(text, style)
+        return copy.copy(proto)
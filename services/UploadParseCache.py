@@ -0,0 +1,71 @@
+import hashlib
+import json
+import threading
+from typing import Optional
+
+from utils.ContentCache import ContentCache, content_hash
+
+SCHEMA_FILE = 'data/schema.json'  # what the LLM is asked to fill in (see ResumeBuilder.parse_file_to_json)
+
+
+class UploadParseCache:
+    """
+    What an uploaded resume file yields, keyed by the SHA-256 of its bytes:
+      - the extracted text, per extractor version;
+      - the ResumeSchema JSON parsed from it by the LLM, per extractor and schema version.
+    Re-uploading the same file skips extraction and the LLM call. Both tiers of the
+    underlying ContentCache are bounded; values are stored as UTF-8 (text) / JSON.
+    """
+
+    def __init__(self, cache: ContentCache):
+        self.cache = cache
+        self._schema_version = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(ContentCache(
+            max_bytes=settings.UPLOAD_CACHE_MAX_BYTES,
+            disk_dir=settings.UPLOAD_CACHE_DISK_DIR,
+            max_disk_bytes=settings.UPLOAD_CACHE_MAX_DISK_BYTES,
+        ))
+
+    @staticmethod
+    def file_digest(file_bytes: bytes) -> str:
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    @property
+    def schema_version(self) -> str:
+        """Hash of the target schema, so editing data/schema.json invalidates every cached parse."""
+        with self._lock:
+            if self._schema_version is None:
+                with open(SCHEMA_FILE, 'rb') as f:
+                    self._schema_version = hashlib.sha256(f.read()).hexdigest()
+            return self._schema_version
+
+    @staticmethod
+    def text_key(digest: str) -> str:
+        # Deferred so that importing the cache (at app start) does not load PyMuPDF
+        from utils.FileOperations import FileOperations
+
+        return content_hash("upload-text", digest, FileOperations.EXTRACTOR_VERSION)
+
+    def parsed_key(self, digest: str) -> str:
+        from utils.FileOperations import FileOperations
+
+        return content_hash("upload-parsed", digest, FileOperations.EXTRACTOR_VERSION, self.schema_version)
+
+    def get_text(self, digest: str) -> Optional[str]:
+        value = self.cache.get(self.text_key(digest))
+        return None if value is None else value.decode('utf-8')
+
+    def put_text(self, digest: str, text: str):
+        self.cache.put(self.text_key(digest), text.encode('utf-8'))
+
+    def get_parsed(self, digest: str) -> Optional[dict]:
+        value = self.cache.get(self.parsed_key(digest))
+        return None if value is None else json.loads(value)
+
+    def put_parsed(self, digest: str, resume_data: dict):
+        """Store a parse only once it validated, so a bad LLM answer is retried on the next upload."""
+        self.cache.put(self.parsed_key(digest), json.dumps(resume_data, ensure_ascii=False).encode('utf-8'))
@@ -1,3 +1,9 @@
 # Marks the services directory as a Python package.
-from .ResumeBuilder import ResumeBuilder
-from .JsonToPDFBuilder import JsonToPDFBuilder
\ No newline at end of file
+# Services are imported on first access, so importing the package does not load
+# ReportLab, PyMuPDF or openai; inside the app, import from the submodule where it is used.
+from core.lazy_imports import lazy_package
+
+lazy_package(__name__, {
+    'ResumeBuilder': 'services.ResumeBuilder',
+    'JsonToPDFBuilder': 'services.JsonToPDFBuilder',
+})
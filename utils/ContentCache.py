@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+def content_hash(*parts) -> str:
+    """SHA-256 over a canonical JSON encoding of `parts` (key order and whitespace don't matter)."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ContentCache:
+    """
+    Content-addressed byte cache with two tiers:
+      - an in-memory LRU bounded by the total size of its values
+      - an optional on-disk tier (one file per key), bounded by total size as well and
+        also least recently used first: a read refreshes the file's mtime, eviction goes
+        by oldest mtime
+    Keys are expected to be hex digests, e.g. from content_hash(). With the disk tier on,
+    get / put / discard do file I/O; call them from a thread when on the event loop.
+    """
+    DISK_LOW_WATER = 0.9  # eviction frees the disk tier down to this share of max_disk_bytes
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None, max_disk_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._disk_size = None  # computed lazily on first disk write
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()  # one eviction scan at a time, outside _lock
+        self.hits = 0
+        self.misses = 0
+
+    # --- memory tier ---
+    def _remember(self, key: str, value: bytes):
+        if len(value) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    # --- disk tier ---
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # recently used: evicted last
+        except OSError:
+            pass
+        return value
+
+    def _scan_disk(self):
+        """(mtime, size, path) of every entry; temp files of writes in flight are not entries."""
+        files = []
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return files
+
+    def _write_disk(self, key: str, value: bytes):
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)  # an entry being overwritten no longer counts
+        except OSError:
+            replaced = 0
+        # Write-then-rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not write cache entry {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        if self.max_disk_bytes is None:
+            return
+        with self._lock:
+            if self._disk_size is not None:
+                self._disk_size += len(value) - replaced
+                if self._disk_size <= self.max_disk_bytes:
+                    return
+        self._evict_disk()
+
+    def _evict_disk(self):
+        """
+        Rescan the disk tier and, when over budget, drop least recently used files down to
+        DISK_LOW_WATER of it, so the next writes don't each rescan. The scan runs outside
+        _lock (memory hits go on meanwhile); a write finding a scan under way skips its own.
+        """
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            files = sorted(self._scan_disk())
+            size = sum(file_size for _, file_size, _ in files)
+            if size > self.max_disk_bytes:
+                target = self.max_disk_bytes * self.DISK_LOW_WATER
+                for _, file_size, old_path in files:
+                    if size <= target:
+                        break
+                    try:
+                        os.remove(old_path)
+                        size -= file_size
+                    except OSError:
+                        pass
+            with self._lock:
+                self._disk_size = size
+        finally:
+            self._evict_lock.release()
+
+    # --- public API ---
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        if self.disk_dir:
+            value = self._read_disk(key)
+            if value is not None:
+                with self._lock:
+                    self._remember(key, value)
+                    self.hits += 1
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            self._remember(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def discard(self, key: str):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            with self._lock:
+                if self._disk_size is not None:
+                    self._disk_size -= size
+
+    def clear(self):
+        """Drop every entry, on disk as well."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        if self.disk_dir:
+            for _, _, path in self._scan_disk():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            with self._lock:
+                self._disk_size = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,218 @@
+import io
+import posixpath
+import re
+import zipfile
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from utils.TextBlock import TextBlock, clean_line, compact_text
+
+RELATIONSHIPS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+R = '{' + RELATIONSHIPS + '}'
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+HYPERLINK_FIELD = re.compile(r'HYPERLINK\s+"([^"]+)"')
+DOCUMENT_REL = RELATIONSHIPS + '/officeDocument'
+HEADER_REL = RELATIONSHIPS + '/header'
+HYPERLINK_REL = RELATIONSHIPS + '/hyperlink'
+
+
+def _part_name(source: str, target: str) -> str:
+    """Zip entry a relationship target points to, relative to its source part unless absolute."""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def _on(props, name: str) -> bool:
+    """Whether a toggle run property (<w:b/>, <w:b w:val="0"/>, ...) is set."""
+    element = props.find(W + name) if props is not None else None
+    return element is not None and element.get(W + 'val') not in ('0', 'false', 'off')
+
+
+def _text_boxes(element):
+    """w:txbxContent elements under `element`, skipping the legacy copies in mc:Fallback."""
+    for child in element:
+        if child.tag == W + 'txbxContent':
+            yield child
+        elif child.tag != MC_FALLBACK:
+            yield from _text_boxes(child)
+
+
+class _Paragraph:
+    """Text, dominant run size / weight and links of one w:p, collected from its runs."""
+
+    def __init__(self, rels: Dict[str, str]):
+        self.rels = rels
+        self.parts = []
+        self.weights = Counter()  # (size, bold) -> characters
+        self.links = []
+        self.text_boxes = []  # w:txbxContent elements, laid out as blocks of their own
+
+    def add_run(self, run, link: Optional[list]):
+        props = run.find(W + 'rPr')
+        size = props.find(W + 'sz') if props is not None else None
+        style = (int(size.get(W + 'val')) / 2 if size is not None else None, _on(props, 'b'))
+        for child in run:
+            tag = child.tag
+            if tag == W + 't':
+                text = child.text or ''
+                self.parts.append(text)
+                self.weights[style] += len(text.strip())
+                if link is not None:
+                    link.append(text)
+            elif tag == W + 'tab':
+                self.parts.append(' ')
+            elif tag in (W + 'br', W + 'cr'):
+                self.parts.append('\n')
+            elif tag == W + 'noBreakHyphen':
+                self.parts.append('-')
+            elif tag == W + 'instrText':
+                match = HYPERLINK_FIELD.search(child.text or '')
+                if match:
+                    self.links.append(('', match.group(1)))
+            else:  # w:drawing, w:pict, mc:AlternateContent: may hold text boxes
+                self.text_boxes.extend(_text_boxes(child))
+
+    def walk(self, element, link: Optional[list] = None):
+        for child in element:
+            tag = child.tag
+            if tag == W + 'r':
+                self.add_run(child, link)
+            elif tag == W + 'hyperlink':
+                anchor = []
+                self.walk(child, anchor)
+                target = self.rels.get(child.get(R + 'id'))
+                if target:
+                    self.links.append((''.join(anchor), target))
+            elif tag == MC_FALLBACK or tag == W + 'pPr':
+                continue
+            else:  # w:ins, w:smartTag, w:sdt / w:sdtContent, w:fldSimple, mc:AlternateContent / mc:Choice, ...
+                self.walk(child, link)
+
+    def block(self, element, kind: str) -> Optional[TextBlock]:
+        text = '\n'.join(filter(None, (clean_line(line) for line in ''.join(self.parts).split('\n'))))
+        if not text and not self.links:
+            return None
+        style = element.find(f'{W}pPr/{W}pStyle')
+        name = (style.get(W + 'val') or '').lower() if style is not None else ''
+        if kind == 'text' and name.startswith(('heading', 'title')):
+            kind = 'heading'
+        (size, bold), _ = self.weights.most_common(1)[0] if self.weights else ((None, False), 0)
+        return TextBlock(text, size=size, bold=bold, kind=kind, links=self.links)
+
+
+class DocxTextExtractor:
+    """
+    Extracts the text blocks of uploaded DOCX files from the WordprocessingML itself:
+    body paragraphs and tables in document order, text boxes, hyperlinks with their
+    anchor text (relationship targets and HYPERLINK fields) and the page headers,
+    which python-docx's `doc.paragraphs` leaves out.
+    The parts are streamed straight out of the zip with an incremental parser: each
+    top-level paragraph / table is turned into blocks as soon as it is complete and
+    then dropped, so no object model of the whole document is ever built.
+    """
+
+    def extract_blocks(self, file_bytes: bytes) -> List[TextBlock]:
+        blocks = []
+        with zipfile.ZipFile(io.BytesIO(file_bytes)) as package:
+            document = self._main_document(package)
+            rels = self._relationships(package, document)
+            for rel_type, target in rels.values():
+                if rel_type == HEADER_REL:
+                    header = _part_name(document, target)
+                    if header in package.NameToInfo:
+                        self._stream(package, header, self._hyperlinks(package, header), blocks, 'header')
+            hyperlinks = {rel_id: target for rel_id, (rel_type, target) in rels.items() if rel_type == HYPERLINK_REL}
+            self._stream(package, document, hyperlinks, blocks, 'text')
+        return blocks
+
+    def extract(self, file_bytes: bytes) -> str:
+        """Compact text of the document for the LLM (see utils.TextBlock.compact_text)."""
+        return compact_text(self.extract_blocks(file_bytes))
+
+    @staticmethod
+    def _main_document(package: zipfile.ZipFile) -> str:
+        """Part name of the main document, from the package relationships (word/document.xml as a rule)."""
+        try:
+            with package.open('_rels/.rels') as f:
+                for rel in ElementTree.parse(f).getroot():
+                    if rel.get('Type') == DOCUMENT_REL:
+                        return rel.get('Target').lstrip('/')
+        except KeyError:
+            pass
+        return 'word/document.xml'
+
+    @staticmethod
+    def _relationships(package: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+        """rId -> (relationship type, target) of a part."""
+        directory, name = posixpath.split(part)
+        try:
+            with package.open(posixpath.join(directory, '_rels', name + '.rels')) as f:
+                root = ElementTree.parse(f).getroot()
+        except KeyError:
+            return {}
+        return {rel.get('Id'): (rel.get('Type'), rel.get('Target')) for rel in root}
+
+    def _hyperlinks(self, package: zipfile.ZipFile, part: str) -> Dict[str, str]:
+        return {rel_id: target for rel_id, (rel_type, target) in self._relationships(package, part).items()
+                if rel_type == HYPERLINK_REL}
+
+    def _stream(self, package: zipfile.ZipFile, part: str, rels: Dict[str, str], blocks: List[TextBlock], kind: str):
+        """Walk the top-level paragraphs / tables of a part as the parser completes them."""
+        # Depth of the block-level elements: w:document > w:body > w:p in the main document,
+        # w:hdr > w:p in a header
+        level = 2 if kind == 'text' else 1
+        depth = 0
+        parent = None
+        with package.open(part) as f:
+            for event, element in ElementTree.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    depth += 1
+                    if depth == level:
+                        parent = element
+                    continue
+                depth -= 1
+                if depth == level and parent is not None:
+                    self._walk((element,), rels, blocks, kind)
+                    parent.remove(element)  # done with it: keep memory flat however long the document is
+
+    def _walk(self, element, rels: Dict[str, str], blocks: List[TextBlock], kind: str):
+        for child in element:
+            tag = child.tag
+            if tag == W + 'p':
+                self._paragraph(child, rels, blocks, kind)
+            elif tag == W + 'tbl':
+                self._table(child, rels, blocks, kind)
+            elif tag == W + 'sdt':
+                content = child.find(W + 'sdtContent')
+                if content is not None:
+                    self._walk(content, rels, blocks, kind)
+
+    def _paragraph(self, element, rels: Dict[str, str], blocks: List[TextBlock], kind: str):
+        paragraph = _Paragraph(rels)
+        paragraph.walk(element)
+        block = paragraph.block(element, kind)
+        if block is not None:
+            blocks.append(block)
+        for box in paragraph.text_boxes:
+            self._walk(box, rels, blocks, kind)
+
+    def _table(self, element, rels: Dict[str, str], blocks: List[TextBlock], kind: str):
+        """A row of one-paragraph cells becomes one "a | b" block; layout tables (cells holding
+        several paragraphs or nested tables) are read cell by cell instead."""
+        for row in element.iterfind(W + 'tr'):
+            cells = row.findall(W + 'tc')
+            if all(len(cell.findall(W + 'p')) <= 1 and cell.find(W + 'tbl') is None for cell in cells):
+                cell_blocks = []
+                for cell in cells:
+                    self._walk(cell, rels, cell_blocks, kind)
+                if cell_blocks:
+                    first = cell_blocks[0]
+                    blocks.append(TextBlock(' | '.join(b.text for b in cell_blocks if b.text), size=first.size,
+                                            bold=first.bold, kind='table' if kind == 'text' else kind,
+                                            links=[link for b in cell_blocks for link in b.links]))
+            else:
+                for cell in cells:
+                    self._walk(cell, rels, blocks, kind)
@@ -1,18 +1,13 @@
 import json
 import os
 from datetime import datetime
-import fitz
-# import pytesseract
-# from PIL import Image
-import io
-from docx import Document
-from docx.opc.constants import RELATIONSHIP_TYPE as RT
-
-from fastapi import HTTPException
 
 
 class FileOperations:
     """File Operations for Resume Builder"""
+    # Bump whenever the text extracted from uploads changes so cached parses are not served stale
+    EXTRACTOR_VERSION = "3"
+
     def __init__(self):
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -36,104 +31,54 @@ class FileOperations:
             f.write(bytes)
 
     def extract_text_from_pdf(self, path):
-        doc = fitz.open(path)
-        full_text = ""
-        for page_num, page in enumerate(doc, start=1):
-            text = page.get_text().strip()
-
-            if text:
-                print(f"[Page {page_num}] Text content found — using regular extraction.")
-                full_text += f"\n\n--- Page {page_num} (Text) ---\n{text}"
-                links = page.get_links()
-                for link in links:
-                    if 'uri' in link:
-                        uri = link['uri']
-                        full_text += f"[Link found on Page {page_num}]: {uri}\n"
-            else:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"No text found on page {page_num}. Consider using OCR for image-based PDFs."
-                )
-                # print(f"[Page {page_num}] No text found — using OCR.")
-                # # Render page as image
-                # pix = page.get_pixmap(dpi=300)
-                # img = Image.open(io.BytesIO(pix.tobytes("png")))
-                #
-                # # Perform OCR on the image
-                # ocr_text = pytesseract.image_to_string(img)
-                # full_text += f"\n\n--- Page {page_num} (OCR) ---\n{ocr_text}"
-
-        doc.close()
-        return full_text
+        with open(path, 'rb') as f:
+            return self.extract_text_from_pdf_bytes(f.read())
 
     def extract_text_from_pdf_bytes(self, file_bytes):
-        doc = fitz.open(stream=file_bytes, filetype="pdf")
-        full_text = ""
-        for page_num, page in enumerate(doc, start=1):
-            text = page.get_text().strip()
-            if text:
-                print(f"[Page {page_num}] Text content found — using regular extraction.")
-                full_text += f"\n\n--- Page {page_num} (Text) ---\n{text}"
-                links = page.get_links()
-                for link in links:
-                    if 'uri' in link:
-                        uri = link['uri']
-                        full_text += f"[Link found on Page {page_num}]: {uri}\n"
-            else:
-                print(f"[Page {page_num}] No text found — using OCR.")
-                pix = page.get_pixmap(dpi=300)
-                img = Image.open(io.BytesIO(pix.tobytes("png")))
-                ocr_text = pytesseract.image_to_string(img)
-                full_text += f"\n\n--- Page {page_num} (OCR) ---\n{ocr_text}"
-        doc.close()
-        return full_text
+        from utils.PDFTextExtractor import get_pdf_extractor
+
+        return get_pdf_extractor().extract(file_bytes)
 
     def extract_text_from_doc(self, path):
-        doc = Document(path)
-        full_text = ""
-        links = []
-        for para in doc.paragraphs:
-            full_text += para.text + "\n"
-        for rel in doc.part.rels.values():
-            if rel.reltype == RT.HYPERLINK:
-                links.append(rel._target)
-
-        # Append links at the end
-        if links:
-            full_text += "\n\n--- Hyperlinks Found ---\n"
-            for idx, uri in enumerate(links, start=1):
-                full_text += f"[Link {idx}]: {uri}\n"
-
-        return full_text
+        with open(path, 'rb') as f:
+            return self.extract_text_from_doc_bytes(f.read())
 
     def extract_text_from_doc_bytes(self, file_bytes):
-        doc = Document(io.BytesIO(file_bytes))
-        full_text = ""
-        links = []
-        for para in doc.paragraphs:
-            full_text += para.text + "\n"
-        for rel in doc.part.rels.values():
-            if rel.reltype == RT.HYPERLINK:
-                links.append(rel._target)
-        if links:
-            full_text += "\n\n--- Hyperlinks Found ---\n"
-            for idx, uri in enumerate(links, start=1):
-                full_text += f"[Link {idx}]: {uri}\n"
-        return full_text
+        from utils.DocxTextExtractor import DocxTextExtractor
+
+        return DocxTextExtractor().extract(file_bytes)
 
     def extract_text_from_file(self, path):
-        if '.pdf' in path:
+        if self.file_type_from_name(path) == 'pdf':
             return self.extract_text_from_pdf(path)
-        elif '.doc' in path:
-            return self.extract_text_from_doc(path)
-
-    def extract_text_from_file_bytes(self, file_bytes, filename):
-        if filename.lower().endswith('.pdf'):
+        return self.extract_text_from_doc(path)
+
+    @staticmethod
+    def file_type_from_name(filename):
+        """'pdf' or 'docx' by extension; legacy binary .doc files cannot be read."""
+        name = filename.lower()
+        if name.endswith('.pdf'):
+            return 'pdf'
+        if name.endswith('.docx'):
+            return 'docx'
+        raise ValueError("Unsupported file type for byte extraction.")
+
+    def extract_text_from_file_bytes(self, file_bytes, filename, file_type=None):
+        """Compact, layout-aware text of an uploaded resume, as sent to the LLM.
+        `file_type` ('pdf' / 'docx', e.g. sniffed by UploadIngestor) wins over the extension."""
+        if (file_type or self.file_type_from_name(filename)) == 'pdf':
             return self.extract_text_from_pdf_bytes(file_bytes)
-        elif filename.lower().endswith('.docx') or filename.lower().endswith('.doc'):
-            return self.extract_text_from_doc_bytes(file_bytes)
-        else:
-            raise ValueError("Unsupported file type for byte extraction.")
+        return self.extract_text_from_doc_bytes(file_bytes)
+
+    def extract_blocks_from_file_bytes(self, file_bytes, filename, file_type=None):
+        """The uploaded resume as utils.TextBlock blocks (text, font size / weight, bbox, page, links)."""
+        if (file_type or self.file_type_from_name(filename)) == 'pdf':
+            from utils.PDFTextExtractor import get_pdf_extractor
+
+            return get_pdf_extractor().extract_blocks(file_bytes)
+        from utils.DocxTextExtractor import DocxTextExtractor
+
+        return DocxTextExtractor().extract_blocks(file_bytes)
 
     def clean_text(self, text):
         return '\n'.join([line.strip() for line in text.splitlines() if line.strip()])
@@ -0,0 +1,40 @@
+import io
+from typing import Optional
+
+
+class OCREngine:
+    """
+    Turns one rasterized page (PNG bytes) into text. Engines are pickled along with
+    every page sent to the OCR workers, so keep them plain: settings in, no open
+    handles. Tests can pass a stub to utils.OCRPipeline instead of Tesseract.
+    """
+
+    @staticmethod
+    def from_settings(settings) -> Optional['OCREngine']:
+        """The configured engine, or None when image-only pages are skipped."""
+        engine = settings.OCR_ENGINE
+        if not engine:
+            return None
+        if engine == "tesseract":
+            return TesseractOCREngine(lang=settings.OCR_LANG)
+        raise ValueError(f"Unknown OCR engine: {engine!r}")
+
+    def image_to_text(self, png: bytes, timeout: Optional[float] = None) -> str:
+        """Text of the image; give up after `timeout` seconds when set."""
+        raise NotImplementedError
+
+
+class TesseractOCREngine(OCREngine):
+    """Tesseract through pytesseract; needs the `tesseract` binary on the PATH."""
+
+    def __init__(self, lang: str = "eng", config: str = ""):
+        self.lang = lang
+        self.config = config
+
+    def image_to_text(self, png: bytes, timeout: Optional[float] = None) -> str:
+        import pytesseract
+        from PIL import Image
+
+        with Image.open(io.BytesIO(png)) as image:
+            # pytesseract kills the tesseract process and raises RuntimeError once `timeout` is up
+            return pytesseract.image_to_string(image, lang=self.lang, config=self.config, timeout=timeout or 0)
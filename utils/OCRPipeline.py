@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, wait
+from typing import Iterable, Iterator, Optional, Tuple
+
+from utils.OCREngine import OCREngine
+
+
+def page_dpi(width: float, height: float, target_pixels: int, min_dpi: int, max_dpi: int) -> int:
+    """Resolution at which a page of width x height points rasterizes to about `target_pixels`
+    on its long side: 300 dpi for US Letter with the defaults, less for large pages, more for small ones."""
+    long_side_inches = max(width, height, 1.0) / 72
+    return int(max(min_dpi, min(max_dpi, target_pixels / long_side_inches)))
+
+
+def ocr_page(page_pdf: bytes, dpi: int, engine: OCREngine, deadline: float) -> Optional[str]:
+    """
+    Rasterize and OCR the single page of `page_pdf`. Module-level so process workers can
+    unpickle it. `deadline` is wall-clock time (time.time()), which means the same in every
+    process: a page only picked up once it has passed is skipped, and the engine is never
+    given longer than what is left.
+    """
+    import fitz
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        return None
+    with fitz.open(stream=page_pdf, filetype="pdf") as doc:
+        # Grayscale: what the OCR engine works on anyway, at a third of the bytes to encode and ship
+        png = doc[0].get_pixmap(dpi=dpi, colorspace=fitz.csGRAY).tobytes("png")
+    return engine.image_to_text(png, timeout=max(1.0, deadline - time.time()))
+
+
+class OCRPipeline:
+    """
+    OCR of the image-only pages of a PDF. Each page is cut out into a one-page PDF (so a
+    worker receives that page's scan rather than the whole upload), rasterized at a DPI
+    picked from its size and handed to the OCR engine, on the given executor when there
+    is one. Whatever is not done within `time_budget` seconds of the start is dropped,
+    so a long scanned document costs bounded time. Results come back in completion
+    order, but the upload parser needs the whole document, so PDFTextExtractor
+    collects them all before returning. Blocking; call it from a thread when on the
+    event loop.
+    """
+
+    def __init__(self, engine: OCREngine, time_budget: float = 20.0, target_pixels: int = 3300,
+                 min_dpi: int = 150, max_dpi: int = 400):
+        self.engine = engine
+        self.time_budget = time_budget
+        self.target_pixels = target_pixels
+        self.min_dpi = min_dpi
+        self.max_dpi = max_dpi
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional['OCRPipeline']:
+        engine = OCREngine.from_settings(settings)
+        if engine is None:
+            return None
+        return cls(
+            engine,
+            time_budget=settings.OCR_TIME_BUDGET_SECONDS,
+            target_pixels=settings.OCR_TARGET_PIXELS,
+            min_dpi=settings.OCR_MIN_DPI,
+            max_dpi=settings.OCR_MAX_DPI,
+        )
+
+    def _pages(self, file_bytes: bytes, page_numbers: Iterable[int]) -> Iterator[Tuple[int, bytes, int]]:
+        """(page number, one-page PDF, dpi) of each requested (1-based) page."""
+        import fitz
+
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            for page_num in page_numbers:
+                rect = doc[page_num - 1].rect
+                with fitz.open() as single:
+                    single.insert_pdf(doc, from_page=page_num - 1, to_page=page_num - 1)
+                    page_pdf = single.tobytes(garbage=1)
+                yield page_num, page_pdf, page_dpi(rect.width, rect.height, self.target_pixels,
+                                                   self.min_dpi, self.max_dpi)
+
+    def iter_pages(self, file_bytes: bytes, page_numbers: Iterable[int], executor=None) -> Iterator[Tuple[int, str]]:
+        """(page number, text) of the given pages, in completion order."""
+        deadline = time.time() + self.time_budget
+        if executor is None:
+            for page_num, page_pdf, dpi in self._pages(file_bytes, page_numbers):
+                text = self._result(page_num, lambda: ocr_page(page_pdf, dpi, self.engine, deadline))
+                if text is not None:
+                    yield page_num, text
+            return
+
+        futures = {executor.submit(ocr_page, page_pdf, dpi, self.engine, deadline): page_num
+                   for page_num, page_pdf, dpi in self._pages(file_bytes, page_numbers)}
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    text = self._result(futures[future], future.result)
+                    if text is not None:
+                        yield futures[future], text
+        finally:
+            # Queued pages are cancelled; running ones stop at the engine's timeout
+            for future in pending:
+                future.cancel()
+        if pending:
+            skipped = sorted(futures[future] for future in pending)
+            print(f"OCR time budget ({self.time_budget}s) used up; skipped page(s) {skipped}.")
+
+    @staticmethod
+    def _result(page_num: int, get) -> Optional[str]:
+        try:
+            text = get()
+        except BrokenExecutor:
+            raise
+        except (ImportError, RuntimeError, OSError) as e:
+            # OCR is best effort: a missing engine or a page it chokes on leaves that page out
+            print(f"[Page {page_num}] OCR failed: {e}")
+            return None
+        if text is None:
+            print(f"[Page {page_num}] OCR time budget used up; page skipped.")
+        return text
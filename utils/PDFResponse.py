@@ -0,0 +1,71 @@
+import re
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def _iter_chunks(view: memoryview, chunk_size: int = CHUNK_SIZE):
+    # Slicing a memoryview is zero-copy; the response body is sent straight from the render buffer
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+def parse_range(range_header: Optional[str], size: int):
+    """
+    Parse a single-range `Range: bytes=...` header into an inclusive (start, end).
+    Returns None when the whole body should be sent (no header, or a multi-range
+    request, which we answer with the full document). Raises 416 if unsatisfiable.
+    """
+    if not range_header or ',' in range_header:
+        return None
+    match = _RANGE_RE.match(range_header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first and last and int(last) < int(first):
+        return None  # syntactically invalid range: ignore it (RFC 7233 3.1)
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,  # Range Not Satisfiable
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def pdf_response(pdf_bytes: bytes, filename: str, range_header: Optional[str] = None,
+                 extra_headers: Optional[dict] = None) -> StreamingResponse:
+    """
+    Stream a rendered PDF without copying it: chunks are memoryview slices of
+    `pdf_bytes`, Content-Length is always set, and byte-range requests get 206
+    so PDF viewers can fetch pages incrementally.
+    """
+    view = memoryview(pdf_bytes)
+    size = len(view)
+    headers = {
+        "Content-Disposition": f"attachment; filename=\"{filename}\"",
+        "Accept-Ranges": "bytes",
+    }
+    if extra_headers:
+        headers.update(extra_headers)
+    byte_range = parse_range(range_header, size)
+    status_code = status.HTTP_200_OK
+    if byte_range:
+        start, end = byte_range
+        view = view[start:end + 1]
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(len(view))
+    return StreamingResponse(_iter_chunks(view), status_code=status_code, media_type="application/pdf",
+                             headers=headers)
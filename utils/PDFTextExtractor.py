@@ -0,0 +1,239 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter
+from typing import List, Optional
+
+from utils.OCRPipeline import OCRPipeline
+from utils.TextBlock import TextBlock, clean_line, compact_text
+
+BULLETS = ('•', '◦', '▪', '●', '-', '–', '*')
+
+
+def _text_block(raw_block, page_num: int) -> Optional[TextBlock]:
+    """
+    A PyMuPDF dict block as a TextBlock. Lines sharing a baseline (e.g. title and date)
+    form one row, joined by " | "; a row wrapped at the block's right edge is joined
+    back with the next, so a paragraph is one line of text.
+    """
+    import fitz
+
+    rows = []  # [y0, y1, x1, [line texts]]
+    weights = Counter()  # (size, bold) -> characters set in it
+    for line in raw_block['lines']:
+        text = clean_line(''.join(span['text'] for span in line['spans']))
+        if not text:
+            continue
+        for span in line['spans']:
+            chars = len(span['text'].strip())
+            if chars:
+                weights[(round(span['size'], 1), bool(span['flags'] & fitz.TEXT_FONT_BOLD))] += chars
+        _, y0, x1, y1 = line['bbox']
+        if rows and rows[-1][0] <= (y0 + y1) / 2 <= rows[-1][1]:
+            rows[-1][2] = max(rows[-1][2], x1)
+            rows[-1][3].append(text)
+        else:
+            rows.append([y0, y1, x1, [text]])
+    if not rows:
+        return None
+    (size, bold), _ = weights.most_common(1)[0]
+    bx0, _, bx1, _ = raw_block['bbox']
+    wrap_edge = bx1 - 0.1 * (bx1 - bx0)
+    lines = []
+    for i, (_, _, x1, texts) in enumerate(rows):
+        text = ' | '.join(texts)
+        previous = rows[i - 1] if i else None
+        if previous and len(previous[3]) == 1 and len(texts) == 1 and previous[2] >= wrap_edge \
+                and not text.startswith(BULLETS):
+            lines[-1] += ' ' + text
+        else:
+            lines.append(text)
+    return TextBlock('\n'.join(lines), page=page_num, bbox=tuple(round(v, 1) for v in raw_block['bbox']),
+                     size=size, bold=bold)
+
+
+def _overlap(a, b) -> float:
+    """Intersection area of two (x0, y0, x1, y1) boxes."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return width * height if width > 0 and height > 0 else 0.0
+
+
+def _attach_links(page, textpage, page_num: int, blocks: List[TextBlock]):
+    """Give every URI link on the page to the block it sits in, with the words it covers as anchor text."""
+    links = [link for link in page.get_links() if 'uri' in link]
+    if not links:
+        return
+    words = page.get_text('words', textpage=textpage)
+    for link in links:
+        x0, y0, x1, y1 = rect = tuple(link['from'])
+        anchor = ' '.join(w[4] for w in words if x0 <= (w[0] + w[2]) / 2 <= x1 and y0 <= (w[1] + w[3]) / 2 <= y1)
+        best, best_area = None, 0.0
+        for block in blocks:
+            area = _overlap(rect, block.bbox)
+            if area > best_area:
+                best, best_area = block, area
+        if best is None:
+            best = TextBlock('', page=page_num, bbox=tuple(round(v, 1) for v in rect))
+            blocks.append(best)
+        best.links.append((anchor, link['uri']))
+
+
+def page_blocks(page, page_num: int) -> List[TextBlock]:
+    """The page's text blocks in reading order; an empty 'ocr' block, filled in later by
+    PDFTextExtractor, when the page has no text layer."""
+    import fitz
+
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES)
+    raw = page.get_text('dict', textpage=textpage)
+    blocks = [block for block in (_text_block(b, page_num) for b in raw['blocks']) if block is not None]
+    if not blocks:
+        return [TextBlock('', page=page_num, kind='ocr')]
+    _attach_links(page, textpage, page_num, blocks)
+    return blocks
+
+
+def _pages_blocks(doc, start: int, stop: int) -> List[TextBlock]:
+    blocks = []
+    for page_num in range(start, stop):
+        blocks.extend(page_blocks(doc[page_num], page_num + 1))
+    return blocks
+
+
+def extract_pages(file_bytes: bytes, start: int, stop: int) -> List[TextBlock]:
+    """Blocks of pages [start, stop) of a PDF. Module-level so process workers can unpickle it."""
+    import fitz
+
+    with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+        return _pages_blocks(doc, start, stop)
+
+
+def split_pages(page_count: int, chunks: int):
+    """[(start, stop)] covering every page in at most `chunks` contiguous, near-equal ranges."""
+    chunks = max(1, min(chunks, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges, start = [], 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+class PDFTextExtractor:
+    """
+    Extracts the text blocks of uploaded PDFs. Short documents (the usual one or two
+    page resume) are read in-process; from `min_parallel_pages` on, the pages are split
+    into contiguous ranges extracted concurrently by a process pool, and the ranges'
+    blocks concatenated in page order. Pages without a text layer (scans) are then OCRed
+    by `ocr`, on the same pool when there are several; without it they are left out.
+    Blocking; call it from a thread when on the event loop.
+    """
+
+    def __init__(self, executor_type: str = "process", max_workers: int = 2, min_parallel_pages: int = 8,
+                 ocr: Optional[OCRPipeline] = None):
+        if executor_type not in ("process", "thread"):
+            raise ValueError(f"Unknown executor type: {executor_type!r}")
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.min_parallel_pages = min_parallel_pages
+        self.ocr = ocr
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            executor_type=settings.EXTRACT_EXECUTOR,
+            max_workers=settings.EXTRACT_WORKERS,
+            min_parallel_pages=settings.EXTRACT_PARALLEL_MIN_PAGES,
+            ocr=OCRPipeline.from_settings(settings),
+        )
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.executor_type == "process":
+                    try:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    except (OSError, NotImplementedError) as e:
+                        # e.g. AWS Lambda has no /dev/shm for multiprocessing primitives
+                        print(f"Process pool unavailable ({e}); extracting PDFs in threads instead.")
+                        self.executor_type = "thread"
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix="pdf-extract")
+            return self._executor
+
+    def _discard_executor(self):
+        # A crashed worker poisons the whole pool; start a fresh one for the next document
+        with self._lock:
+            self._executor = None
+
+    def extract_blocks(self, file_bytes: bytes) -> List[TextBlock]:
+        import fitz
+
+        with fitz.open(stream=file_bytes, filetype="pdf") as doc:
+            page_count = doc.page_count
+            if self.max_workers < 2 or page_count < max(2, self.min_parallel_pages):
+                blocks = _pages_blocks(doc, 0, page_count)
+            else:
+                blocks = None
+        if blocks is None:
+            executor = self._get_executor()
+            if not isinstance(file_bytes, bytes):
+                file_bytes = bytes(file_bytes)  # a memoryview (e.g. of a spooled upload) does not pickle
+            try:
+                futures = [executor.submit(extract_pages, file_bytes, start, stop)
+                           for start, stop in split_pages(page_count, self.max_workers)]
+                blocks = [block for future in futures for block in future.result()]
+            except BrokenProcessPool:
+                self._discard_executor()
+                raise
+        self._ocr_blocks(file_bytes, blocks)
+        return blocks
+
+    def _ocr_blocks(self, file_bytes: bytes, blocks: List[TextBlock]):
+        """Fill in the empty 'ocr' blocks of image-only pages; returns once every page is done or out of time."""
+        pages = {block.page: block for block in blocks if block.kind == 'ocr' and not block.text}
+        if not pages:
+            return
+        if self.ocr is None:
+            print(f"No OCR engine configured; leaving out image-only page(s) {sorted(pages)}.")
+            return
+        print(f"No text layer on page(s) {sorted(pages)}; using OCR.")
+        executor = self._get_executor() if self.max_workers >= 2 and len(pages) > 1 else None
+        try:
+            for page_num, text in self.ocr.iter_pages(file_bytes, sorted(pages), executor):
+                pages[page_num].text = text
+        except BrokenProcessPool as e:
+            # Keep the pages OCRed so far rather than failing the whole upload
+            print(f"OCR workers crashed ({e}); image-only pages left are skipped.")
+            self._discard_executor()
+
+    def extract(self, file_bytes: bytes) -> str:
+        """Compact text of the document for the LLM (see utils.TextBlock.compact_text)."""
+        return compact_text(self.extract_blocks(file_bytes))
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_extractor: Optional[PDFTextExtractor] = None
+
+
+def get_pdf_extractor() -> PDFTextExtractor:
+    """The process-wide extractor, so every upload shares one worker pool."""
+    global _extractor
+    if _extractor is None:
+        from core.config import settings
+        _extractor = PDFTextExtractor.from_settings(settings)
+    return _extractor
+
+
+def shutdown_pdf_extractor():
+    if _extractor is not None:
+        _extractor.shutdown()
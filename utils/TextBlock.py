@@ -0,0 +1,115 @@
+import re
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+_SPACES = re.compile(r'[ \t\u00a0\u2000-\u200a\u202f\u3000]+')
+
+
+def clean_line(text: str) -> str:
+    return _SPACES.sub(' ', text).strip()
+
+
+class TextBlock:
+    """
+    One block of an uploaded resume as laid out in the source document: a PDF text
+    block or a DOCX paragraph / table row, with the dominant font size (pt) and
+    weight of its text, its bounding box and page (PDF only) and the hyperlinks
+    inside it as (anchor text, uri) pairs. Plain and picklable, so process workers
+    can send blocks back.
+    """
+    __slots__ = ('text', 'page', 'bbox', 'size', 'bold', 'kind', 'links')
+
+    def __init__(self, text: str, page: Optional[int] = None,
+                 bbox: Optional[Tuple[float, float, float, float]] = None, size: Optional[float] = None,
+                 bold: bool = False, kind: str = 'text', links: Optional[List[Tuple[str, str]]] = None):
+        self.text = text
+        self.page = page
+        self.bbox = bbox
+        self.size = size
+        self.bold = bold
+        self.kind = kind  # text, heading (styled as one in DOCX), table (one row, cells joined by " | "), header, ocr
+        self.links = links if links is not None else []
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"TextBlock({self.text[:40]!r}, page={self.page}, size={self.size}, bold={self.bold}, kind={self.kind!r})"
+
+
+def body_size(blocks: Iterable[TextBlock]) -> Optional[float]:
+    """Most common font size, weighted by text length: the size of the document's body text."""
+    sizes = Counter()
+    for block in blocks:
+        if block.size:
+            sizes[block.size] += len(block.text)
+    return sizes.most_common(1)[0][0] if sizes else None
+
+
+def is_heading(block: TextBlock, body: Optional[float]) -> bool:
+    if block.kind == 'heading':
+        return True
+    if block.kind != 'text' or '\n' in block.text or not block.size or not body:
+        return False
+    # Section titles and the name: one line, set clearly larger than the body text or in bold capitals
+    return block.size >= body * 1.15 or (block.bold and block.text.isupper())
+
+
+def _visible(uri: str, text: str) -> bool:
+    """Whether the link target is already spelled out in the text (e.g. a printed e-mail address)."""
+    target = uri.split(':', 1)[1] if uri.startswith(('mailto:', 'tel:')) else uri
+    target = target.split('://', 1)[-1].rstrip('/')
+    if target.startswith('www.'):
+        target = target[4:]
+    return target.lower() in text.lower()
+
+
+def _with_links(block: TextBlock, text: str, seen_uris: set) -> str:
+    for anchor, uri in block.links:
+        if uri in seen_uris:
+            continue
+        seen_uris.add(uri)
+        if _visible(uri, text):
+            continue
+        anchor = clean_line(anchor or '')
+        if anchor and anchor in text:
+            text = text.replace(anchor, f'[{anchor}]({uri})', 1)
+        else:
+            text = f'{text} <{uri}>' if text else f'<{uri}>'
+    return text
+
+
+def compact_text(blocks: List[TextBlock]) -> str:
+    """
+    The text sent to the LLM: one line per source line, whitespace collapsed, headings
+    marked with "# ", links inlined as [anchor](uri) unless the address is printed anyway,
+    and no page banners. Repeated running headers / footers (the same text at the same
+    height on several pages), repeated DOCX headers and repeated links appear once.
+    """
+    body = body_size(blocks)
+    seen_uris = set()
+    running = set()
+    lines = []
+    for block in blocks:
+        text = '\n'.join(filter(None, (clean_line(line) for line in block.text.splitlines())))
+        # Running headers / footers are short single lines; whole paragraphs are never dropped
+        if block.kind == 'header' or (block.bbox is not None and '\n' not in text and len(text) <= 100):
+            key = (block.kind, text, None if block.bbox is None else round(block.bbox[1]))
+            if key in running:
+                continue
+            running.add(key)
+        text = _with_links(block, text, seen_uris)
+        if not text:
+            continue
+        if is_heading(block, body):
+            lines.append(f'\n# {text}')
+        else:
+            lines.append(text)
+    return '\n'.join(lines).strip()
@@ -0,0 +1,262 @@
+import hashlib
+import io
+import mmap
+import tempfile
+import zipfile
+from typing import Optional, Tuple
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # legacy binary Office files (.doc)
+DOCX_DOCUMENT = 'word/document.xml'
+
+
+def sniff_file_type(head: bytes) -> str:
+    """'pdf', 'zip', 'ole' or 'unknown', from the first bytes of a file."""
+    # Readers accept a PDF header anywhere in the first 1024 bytes (some generators prepend junk)
+    if PDF_MAGIC in head[:1024]:
+        return 'pdf'
+    if head.startswith(ZIP_MAGIC):
+        return 'zip'
+    if head.startswith(OLE_MAGIC):
+        return 'ole'
+    return 'unknown'
+
+
+class UploadRejected(Exception):
+    """Raised when an upload is refused before any extraction; carries the HTTP status to answer with."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class SpooledUpload:
+    """
+    An ingested upload: its size, SHA-256 and detected type ('pdf' or 'docx'), and its
+    bytes, kept in memory up to `spool_memory_bytes` and in an anonymous temp file past
+    that. Close it (or use it as a context manager) to drop the temp file.
+    """
+
+    def __init__(self, filename: str, spool_memory_bytes: int):
+        self.filename = filename
+        self.spool_memory_bytes = spool_memory_bytes
+        self.file_type = None
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._buffer = bytearray()
+        self._file = None
+        self._mmap = None
+
+    @property
+    def digest(self) -> str:
+        """Hex SHA-256 of the contents, as UploadParseCache.file_digest would compute it."""
+        return self._sha256.hexdigest()
+
+    @property
+    def spooled(self) -> bool:
+        return self._file is not None
+
+    def write(self, chunk: bytes):
+        self._sha256.update(chunk)
+        self.size += len(chunk)
+        if self._file is None and len(self._buffer) + len(chunk) > self.spool_memory_bytes:
+            self._file = tempfile.TemporaryFile(prefix='upload-')
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        if self._file is not None:
+            self._file.write(chunk)
+        else:
+            self._buffer += chunk
+
+    def open(self):
+        """A binary file object over the contents, positioned at the start."""
+        if self._file is None:
+            return io.BytesIO(self._buffer)
+        self._file.flush()
+        self._file.seek(0)
+        return self._file
+
+    def data(self):
+        """
+        The contents as a memoryview, of the in-memory buffer or of a read-only mmap of the
+        temp file. PyMuPDF opens either in place, so a large upload is paged in on demand
+        instead of copied onto the heap.
+        """
+        if self._file is None:
+            return memoryview(self._buffer)
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def close(self):
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # a view is still referenced somewhere; the map goes with it
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class UploadIngestor:
+    """
+    Reads resume uploads chunk by chunk before anything else touches them. The first
+    chunk decides the type from its magic bytes, so a legacy .doc or a stray image is
+    refused (415) without reading the rest; the size cap is enforced as chunks arrive
+    (413); DOCX packages are checked for word/document.xml and a sane uncompressed size.
+    What passes is a SpooledUpload, hashed on the way in, ready for the cache lookup
+    and the extractors.
+    """
+
+    def __init__(self, max_bytes: int = 10 * 1024 * 1024, chunk_bytes: int = 64 * 1024,
+                 spool_memory_bytes: int = 1024 * 1024, max_docx_xml_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.chunk_bytes = chunk_bytes
+        self.spool_memory_bytes = spool_memory_bytes
+        self.max_docx_xml_bytes = max_docx_xml_bytes
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            max_bytes=settings.UPLOAD_MAX_BYTES,
+            chunk_bytes=settings.UPLOAD_CHUNK_BYTES,
+            spool_memory_bytes=settings.UPLOAD_SPOOL_MEMORY_BYTES,
+            max_docx_xml_bytes=settings.UPLOAD_MAX_DOCX_XML_BYTES,
+        )
+
+    async def ingest(self, upload_file) -> SpooledUpload:
+        """Ingest a FastAPI UploadFile (anything with an async read(size)); raises UploadRejected."""
+        upload = SpooledUpload(upload_file.filename or '', self.spool_memory_bytes)
+        try:
+            chunk = await upload_file.read(self.chunk_bytes)
+            if not chunk:
+                raise UploadRejected(400, "The uploaded file is empty.")
+            kind = self._check_head(chunk)
+            while chunk:
+                if upload.size + len(chunk) > self.max_bytes:
+                    limit = f"{self.max_bytes / (1024 * 1024):.3g} MB"
+                    raise UploadRejected(413, f"Resume files are limited to {limit}.")
+                upload.write(chunk)
+                chunk = await upload_file.read(self.chunk_bytes)
+            upload.file_type = 'pdf' if kind == 'pdf' else self._check_docx(upload)
+        except BaseException:
+            upload.close()
+            raise
+        return upload
+
+    @staticmethod
+    def _check_head(head: bytes) -> str:
+        kind = sniff_file_type(head)
+        if kind == 'ole':
+            raise UploadRejected(415, "Legacy .doc files are not supported; save the resume as .docx or PDF.")
+        if kind == 'unknown':
+            raise UploadRejected(415, "Unsupported file type; upload a PDF or .docx resume.")
+        return kind
+
+    def _check_docx(self, upload: SpooledUpload) -> str:
+        """Only the zip's central directory is read; the document itself is left to the extractor."""
+        try:
+            with zipfile.ZipFile(upload.open()) as package:
+                info = package.NameToInfo.get(DOCX_DOCUMENT)
+        except zipfile.BadZipFile:
+            raise UploadRejected(415, "The uploaded file is not a valid .docx document.")
+        if info is None:
+            raise UploadRejected(415, "Unsupported file type; upload a PDF or .docx resume.")
+        if info.file_size > self.max_docx_xml_bytes:
+            raise UploadRejected(413, "The .docx document is too large once decompressed.")
+        return 'docx'
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware refusing request bodies over `max_body_bytes` on the given path
+    suffixes with 413, before the multipart parser spools them: up front from
+    Content-Length, otherwise as soon as the streamed (chunked) body goes over. In that
+    case the app sees the body fail mid-parse and answers with an error of its own
+    (FastAPI turns any form parsing failure into a 400); that response is swapped for the 413.
+    """
+
+    class _BodyTooLarge(Exception):
+        pass
+
+    BODY = b'{"detail":"Upload too large."}'
+
+    def __init__(self, app, max_body_bytes: int, path_suffixes: Tuple[str, ...]):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_suffixes = path_suffixes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or not scope['path'].endswith(self.path_suffixes):
+            return await self.app(scope, receive, send)
+        declared = self._content_length(scope)
+        if declared is not None and declared > self.max_body_bytes:
+            return await self._reject(send)
+
+        received = 0
+        too_large = False
+        started = False  # the app's response has begun going out as is
+        replaced = False  # the app's response is being swapped for the 413
+
+        async def limited_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > self.max_body_bytes:
+                    too_large = True
+                    raise self._BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal started, replaced
+            if message['type'] == 'http.response.start':
+                if too_large and not started:
+                    replaced = True
+                    await send(self._start_message())
+                    return
+                started = True
+            elif message['type'] == 'http.response.body' and replaced:
+                if not message.get('more_body', False):
+                    await send({'type': 'http.response.body', 'body': self.BODY})
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except self._BodyTooLarge:
+            if started or replaced:
+                raise
+            await self._reject(send)
+
+    @staticmethod
+    def _content_length(scope) -> Optional[int]:
+        for name, value in scope.get('headers', ()):
+            if name == b'content-length':
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    def _start_message(self) -> dict:
+        return {'type': 'http.response.start', 'status': 413,
+                'headers': [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(self.BODY)).encode()),
+                            (b'connection', b'close')]}
+
+    async def _reject(self, send):
+        await send(self._start_message())
+        await send({'type': 'http.response.body', 'body': self.BODY})
@@ -0,0 +1,47 @@
+import io
+import zipfile
+from typing import List
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that collects whatever zipfile writes into it."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> List[bytes]:
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally for streaming responses: after each add()
+    the bytes written so far can be drained and sent, so only one member is ever
+    held in memory. Entries use data descriptors, as the output is not seekable.
+    """
+
+    def __init__(self, compression=zipfile.ZIP_STORED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode='w', compression=compression)
+
+    def add(self, name: str, data: bytes) -> List[bytes]:
+        self._zip.writestr(name, data)
+        return self._sink.drain()
+
+    def close(self) -> List[bytes]:
+        self._zip.close()
+        return self._sink.drain()
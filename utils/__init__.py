@@ -1,5 +1,9 @@
 # This file marks the utils directory as a Python package.
-from .FileOperations import FileOperations
-from .WebScraper import WebScraper
+from core.lazy_imports import lazy_package
 from .auth import *
 
+# PyMuPDF and BeautifulSoup / lxml are only loaded when these are first used
+lazy_package(__name__, {
+    'FileOperations': 'utils.FileOperations',
+    'WebScraper': 'utils.WebScraper',
+})